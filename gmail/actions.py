@@ -1,22 +1,63 @@
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import chain, islice
+
 import questionary
+from googleapiclient.errors import HttpError
 from rich.console import Console
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, BarColumn, TextColumn, TaskProgressColumn
 from rich.table import Table
 
-from gmail.analyzer import get_header, get_age_days, is_job_email, is_newsletter, is_personal_email, is_priority, categorize
-from gmail.client import list_messages, get_message_metadata, trash_message, modify_labels, get_or_create_label
-from gmail.duplicates import find_duplicates
+from gmail.analyzer import DATE_EPOCH, DEFAULT_PRIORITY_KEYWORDS, get_header, get_age_days, header_dict, is_job_email, is_newsletter, is_personal_email, priority_checker, categorize
+from gmail.client import BATCH_SIZE, BATCH_WORKERS, FETCH_WORKERS, batch_get_metadata, batch_modify_labels, batch_trash, clone_service, fetch_metadata_concurrently, forget_label, get_or_create_label, per_thread_service, resolve_labels
+from gmail.duplicates import DuplicateTracker, find_duplicates
+from gmail.inbox_cache import HeaderCache, PrefetchCancelled
+from gmail.message_cache import get_cached, put_many
 from gmail.state import load_reviewed, mark_reviewed
-from gmail.unsubscribe import attempt_unsubscribe, get_unsubscribe_links, is_job_alert, print_unsubscribe_report
+from gmail.unsubscribe import attempt_unsubscribe_many, get_unsubscribe_links, is_job_alert, print_unsubscribe_report
 
 console = Console()
 
+# Shared by every action in this process so chained menu actions reuse one fetch
+_header_cache = HeaderCache()
+
+
+def _fetch_chunk(service, chunk, refetch):
+    """Fetch headers for up to BATCH_SIZE message IDs, returned in chunk order.
 
-def _fetch_with_headers(service, msg_list):
-    """Fetch metadata headers for each message in msg_list, with a progress bar."""
-    results = []
-    total = len(msg_list)
+    refetch(msg_ids) fetches whatever the batch couldn't deliver, one request each.
+    """
+    try:
+        fetched = batch_get_metadata(service, chunk)
+    except Exception:
+        fetched = {}
+    missing = [msg_id for msg_id in chunk if msg_id not in fetched]
+    if missing:
+        fetched.update(refetch(missing))
+    return [
+        (msg_id, header_dict(fetched[msg_id].get("payload", {}).get("headers", [])))
+        for msg_id in chunk
+    ]
+
+
+def _fetch_with_headers(service, msg_pages, quiet=False, stop=None):
+    """Fetch metadata headers for messages arriving in pages, one batched call per 100 messages.
+
+    Returns (msg_id, header_dict) pairs in listing order, so every analyzer
+    downstream does O(1) lookups. Messages already in the on-disk header
+    cache are not fetched again. Up to BATCH_WORKERS batches run at once,
+    each thread on its own service; messages a batch drops are retried on one
+    shared pool of FETCH_WORKERS threads. The progress total grows as pages are
+    listed, so fetching starts with the first page. quiet hides the progress
+    bar and stop (an Event) abandons the fetch, both for background prefetches.
+    """
+    thread_service = per_thread_service(service)
+    fallback_service = per_thread_service(service)
+    pages = []  # (ids, cached headers, futures) per listing page
+    listed = 0
     with Progress(
         SpinnerColumn(),
         TextColumn("[bold cyan]{task.description}"),
@@ -24,25 +65,106 @@ def _fetch_with_headers(service, msg_list):
         TaskProgressColumn(),
         console=console,
         transient=True,
-    ) as progress:
-        task = progress.add_task("Fetching emails", total=total)
-        for msg in msg_list:
-            meta = get_message_metadata(service, msg["id"])
-            results.append((msg["id"], meta.get("payload", {}).get("headers", [])))
-            progress.advance(task)
+        disable=quiet,
+    ) as progress, ThreadPoolExecutor(max_workers=BATCH_WORKERS) as pool, \
+            ThreadPoolExecutor(max_workers=FETCH_WORKERS) as fallback:
+        refetch = partial(fetch_metadata_concurrently, fallback_service, pool=fallback)
+
+        def _fetch(chunk):
+            if stop is not None and stop.is_set():
+                raise PrefetchCancelled()
+            return _fetch_chunk(thread_service(), chunk, refetch)
+
+        task = progress.add_task("Fetching emails", total=None)
+        for page in msg_pages:
+            if stop is not None and stop.is_set():
+                raise PrefetchCancelled()
+            listed += len(page)
+            progress.update(task, total=listed)
+            page_ids = [msg["id"] for msg in page]
+            cached = get_cached(page_ids)
+            progress.advance(task, len(cached))
+            futures = []
+            ids = iter([msg_id for msg_id in page_ids if msg_id not in cached])
+            while chunk := list(islice(ids, BATCH_SIZE)):
+                future = pool.submit(_fetch, chunk)
+                future.add_done_callback(lambda _, n=len(chunk): progress.advance(task, n))
+                futures.append(future)
+            pages.append((page_ids, cached, futures))
+
+        results = []
+        fetched = []
+        for page_ids, headers_by_id, futures in pages:
+            for future in futures:
+                rows = future.result()
+                fetched.extend(rows)
+                headers_by_id.update(rows)
+            results.extend((msg_id, headers_by_id[msg_id]) for msg_id in page_ids)
+    put_many(fetched)
     return results
 
 
-def _apply_labels(service, to_label):
-    """Apply labels to a list of (msg_id, label_name) pairs, caching label IDs."""
-    label_cache = {}
-    for msg_id, label_name in to_label:
-        if label_name not in label_cache:
-            label_cache[label_name] = get_or_create_label(service, label_name)
-        modify_labels(service, msg_id, add_labels=[label_cache[label_name]])
+def _load_inbox_headers(service, query="in:inbox", max_results=500, cache=None):
+    """Return (msg_id, headers) rows for messages matching query, via the session cache."""
+    return (cache or _header_cache).get(service, query, max_results, _fetch_with_headers)
+
+
+def prefetch_inbox(service, cache=None):
+    """Start fetching the inbox in the background, e.g. while the user is still choosing an action.
+
+    Runs on its own service so the caller can keep using `service` meanwhile.
+    """
+    fetch = partial(_fetch_with_headers, quiet=True)
+    (cache or _header_cache).prefetch(clone_service(service), "in:inbox", 500, fetch)
+
+
+def cancel_prefetch(cache=None, wait=False):
+    """Stop a running prefetch_inbox, e.g. because the user is quitting.
+
+    Pass wait=True before signout, so the prefetch can't write account data after it.
+    """
+    (cache or _header_cache).cancel_prefetch(wait=wait)
+
+
+def _priority_exclusions(priority_keywords, priority_senders):
+    """Gmail query terms that drop priority emails server-side, so they are never fetched."""
+    def _group(terms):
+        return " OR ".join('"' + t.replace('"', "") + '"' for t in terms if t.strip('" '))
+
+    query = ""
+    if senders := _group(priority_senders):
+        query += f" -from:({senders})"
+    if keywords := _group(list(DEFAULT_PRIORITY_KEYWORDS) + list(priority_keywords)):
+        query += f" -subject:({keywords})"
+    return query
+
 
+def _age_label(age_days):
+    if age_days == 0:
+        return "today"
+    if age_days == 1:
+        return "yesterday"
+    return f"{age_days}d ago"
 
-def _scan(service, config):
+
+def _apply_labels(service, to_label):
+    """Apply labels to a list of (msg_id, label_name) pairs, one batched run per label."""
+    by_label = defaultdict(list)
+    for msg_id, label_name in to_label:
+        by_label[label_name].append(msg_id)
+    label_ids = resolve_labels(service, by_label)  # one labels.list for all of them
+    for label_name, msg_ids in by_label.items():
+        try:
+            batch_modify_labels(service, msg_ids, add_labels=[label_ids[label_name]])
+        except HttpError as e:
+            if e.resp.status != 400:
+                raise
+            # An ID saved by an earlier run may belong to a label deleted since
+            forget_label(label_name)
+            batch_modify_labels(service, msg_ids, add_labels=[get_or_create_label(service, label_name)])
+
+
+def _scan(service, config, cache=None):
     """
     Scan the inbox and categorize all emails.
     Filters out already-reviewed message IDs.
@@ -54,20 +176,27 @@ def _scan(service, config):
     priority_keywords = rules.get("priority_keywords", [])
     priority_senders = rules.get("priority_senders", [])
 
-    all_msgs = list_messages(service, query="in:inbox", max_results=500)
-    console.print(f"  Found [bold yellow]{len(all_msgs)}[/] messages in inbox. Fetching details...")
-    msgs_with_headers = _fetch_with_headers(service, all_msgs)
+    msgs_with_headers = _load_inbox_headers(service, cache=cache)
+    console.print(f"  Found [bold yellow]{len(msgs_with_headers)}[/] messages in inbox.")
 
     reviewed = load_reviewed()
+    # One cutoff for the whole scan instead of an age computation per email
+    now = time.time()
+    cutoff_epoch = now - delete_days * 86400
 
     to_trash = []
     to_priority = []
-    category_groups = {}
+    category_groups = defaultdict(list)
     newsletter_items = []   # parallel list with category_groups["Newsletters"]
     skipped_count = 0
 
+    is_priority = priority_checker(priority_keywords, priority_senders)
+    dup_tracker = DuplicateTracker()
     for msg_id, headers in msgs_with_headers:
-        if is_priority(headers, priority_keywords, priority_senders):
+        # Before any `continue`, so old and priority emails still count as duplicates
+        dup_tracker.add(msg_id, headers)
+
+        if is_priority(headers):
             to_priority.append(msg_id)
             continue
 
@@ -76,8 +205,9 @@ def _scan(service, config):
             to_priority.append(msg_id)
             continue
 
-        age = get_age_days(headers)
-        if age >= delete_days:
+        # Undated emails count as brand new, as get_age_days treats them
+        date_epoch = headers[DATE_EPOCH]
+        if (now if date_epoch is None else date_epoch) <= cutoff_epoch:
             to_trash.append(msg_id)
             continue
 
@@ -89,19 +219,18 @@ def _scan(service, config):
         if is_newsletter(headers):
             links = get_unsubscribe_links(headers)
             newsletter_items.append((
-                get_header(headers, "From"),
-                get_header(headers, "Subject"),
+                headers.get("from", ""),
+                headers.get("subject", ""),
                 links or {},
             ))
-            category_groups.setdefault("Newsletters", []).append(msg_id)
+            category_groups["Newsletters"].append(msg_id)
             continue
 
         category = categorize(headers)
         if category:
-            category_groups.setdefault(category, []).append(msg_id)
+            category_groups[category].append(msg_id)
 
-    dup_groups = find_duplicates(msgs_with_headers)
-    dup_ids = [msg_id for group in dup_groups for msg_id in group[1:]]
+    dup_ids = list(chain.from_iterable(group[1:] for group in dup_tracker.groups()))
 
     if skipped_count:
         console.print(
@@ -112,19 +241,20 @@ def _scan(service, config):
     return {
         "to_trash": to_trash,
         "to_priority": to_priority,
-        "category_groups": category_groups,
+        "category_groups": dict(category_groups),
         "newsletter_items": newsletter_items,
         "dup_ids": dup_ids,
         "delete_days": delete_days,
     }
 
 
-def run_cleanup(service, config, dry_run=True):
+def run_cleanup(service, config, dry_run=True, cache=None):
     """Full scan: auto-handle old/priority/duplicates, then ask user what to do per category."""
     max_trash = config.get("automation", {}).get("max_trash_per_run", 500)
 
     console.print("\n[bold cyan]Scanning Gmail...[/]\n")
-    result = _scan(service, config)
+    cache = cache or _header_cache
+    result = _scan(service, config, cache)
 
     # --- Auto-actions summary ---
     table = Table(title="Auto-actions", show_header=True, header_style="bold cyan")
@@ -208,6 +338,10 @@ def run_cleanup(service, config, dry_run=True):
         else:
             skipped_ids.extend(msg_ids)  # "s" — remember these for next run
 
+    # An old email can also be a duplicate, and a duplicate can be a priority email
+    priority = set(result["to_priority"])
+    to_trash = [mid for mid in dict.fromkeys(to_trash) if mid not in priority]
+
     if len(to_trash) > max_trash:
         console.print(f"[bold red]Safety cap:[/] {len(to_trash)} to trash, limit is {max_trash} (set in config.yaml).")
         to_trash = to_trash[:max_trash]
@@ -228,11 +362,10 @@ def run_cleanup(service, config, dry_run=True):
         return
 
     console.print("[bold cyan]Applying changes...[/]")
-    for msg_id in to_trash:
-        trash_message(service, msg_id)
+    batch_trash(service, to_trash)
+    cache.discard(to_trash)
     _apply_labels(service, to_label)
-    for msg_id in result["to_priority"]:
-        modify_labels(service, msg_id, add_labels=["STARRED"])
+    batch_modify_labels(service, result["to_priority"], add_labels=["STARRED"])
 
     # Mark labeled and skipped emails as reviewed so they don't reappear
     mark_reviewed([mid for mid, _ in to_label] + skipped_ids)
@@ -243,13 +376,13 @@ def run_cleanup(service, config, dry_run=True):
     )
 
 
-def run_unsubscribe_only(service, config, dry_run=True):
+def run_unsubscribe_only(service, config, dry_run=True, cache=None):
     """Scan for newsletter emails, list unsubscribe links, and optionally unsubscribe."""
     max_trash = config.get("automation", {}).get("max_trash_per_run", 500)
 
     console.print("\n[bold cyan]Scanning for newsletter emails...[/]\n")
-    all_msgs = list_messages(service, query="in:inbox", max_results=500)
-    msgs_with_headers = _fetch_with_headers(service, all_msgs)
+    cache = cache or _header_cache
+    msgs_with_headers = _load_inbox_headers(service, cache=cache)
 
     reviewed = load_reviewed()
     items = []        # (sender, subject, links) — new, with parseable unsubscribe links
@@ -301,18 +434,11 @@ def run_unsubscribe_only(service, config, dry_run=True):
     # --- Let user pick which senders to unsubscribe from ---
     if items:
         console.print("[dim]  All selected by default — Space = deselect   ↑↓ = navigate   Enter = confirm[/]\n")
-        choices = [
-            questionary.Choice(
-                title=(
-                    f"[JOB ALERT] {(sender or '—')[:45]}"
-                    if is_job_alert(sender, subject)
-                    else f"{(sender or '—')[:55]}"
-                ),
-                value=i,
-                checked=True,
-            )
-            for i, (sender, subject, links) in enumerate(items)
+        titles = [
+            f"[JOB ALERT] {(sender or '—')[:45]}" if is_job_alert(sender, subject) else (sender or "—")[:55]
+            for sender, subject, _ in items
         ]
+        choices = [questionary.Choice(title=title, value=i, checked=True) for i, title in enumerate(titles)]
         selected_indices = questionary.checkbox(
             f"Unsubscribe from ({len(items)} selected — uncheck any to skip):",
             choices=choices,
@@ -323,21 +449,18 @@ def run_unsubscribe_only(service, config, dry_run=True):
             return
 
         if selected_indices:
-            import time
             console.print()
             if len(selected_indices) > 10:
                 console.print(
                     f"[dim]Sending {len(selected_indices)} requests with a small delay "
                     f"to avoid Gmail rate limits...[/]\n"
                 )
-            result_rows = []
-            for idx, i in enumerate(selected_indices):
-                sender, subject, links = items[i]
-                method, status = attempt_unsubscribe(service, links)
-                result_rows.append((sender, method, status))
-                # Pace mailto sends to avoid hitting Gmail's sending rate limit
-                if method == "mailto" and idx < len(selected_indices) - 1:
-                    time.sleep(1)
+            # HTTP unsubscribes run concurrently; mailto sends stay paced
+            outcomes = attempt_unsubscribe_many(service, [items[i][2] for i in selected_indices])
+            result_rows = [
+                (items[i][0], method, status)
+                for i, (method, status) in zip(selected_indices, outcomes)
+            ]
 
             result_table = Table(show_header=True, header_style="bold cyan")
             result_table.add_column("Sender", style="white", max_width=50)
@@ -376,23 +499,23 @@ def run_unsubscribe_only(service, config, dry_run=True):
                     f"limit is {max_trash} (set in config.yaml)."
                 )
                 to_delete = to_delete[:max_trash]
-            for msg_id in to_delete:
-                trash_message(service, msg_id)
+            batch_trash(service, to_delete)
+            cache.discard(to_delete)
             console.print(f"[bold green]Deleted {len(to_delete)} emails.[/]")
         else:
             # Skipped — remember them so they don't reappear
             mark_reviewed([mid for mid, _ in to_label])
 
 
-def run_duplicates_only(service, config, dry_run=True):
+def run_duplicates_only(service, config, dry_run=True, cache=None):
     """Find and optionally trash duplicate emails."""
     max_trash = config.get("automation", {}).get("max_trash_per_run", 500)
     console.print("\n[bold cyan]Scanning for duplicate emails...[/]\n")
-    all_msgs = list_messages(service, query="in:inbox", max_results=500)
-    msgs_with_headers = _fetch_with_headers(service, all_msgs)
+    cache = cache or _header_cache
+    msgs_with_headers = _load_inbox_headers(service, cache=cache)
 
     dup_groups = find_duplicates(msgs_with_headers)
-    dup_ids = [msg_id for group in dup_groups for msg_id in group[1:]]
+    dup_ids = list(chain.from_iterable(group[1:] for group in dup_groups))
 
     if not dup_ids:
         console.print("  [bold green]No duplicates found.[/]")
@@ -410,16 +533,15 @@ def run_duplicates_only(service, config, dry_run=True):
     dup_ids = dup_ids[:max_trash]
     confirmed = questionary.confirm(f"Move {len(dup_ids)} duplicate emails to Trash?", default=False).ask()
     if confirmed:
-        for msg_id in dup_ids:
-            trash_message(service, msg_id)
+        batch_trash(service, dup_ids)
+        cache.discard(dup_ids)
         console.print(f"[bold green]Trashed {len(dup_ids)} duplicates.[/]")
 
 
-def run_organize_only(service, config, dry_run=True):
+def run_organize_only(service, config, dry_run=True, cache=None):
     """Categorize inbox emails and apply labels."""
     console.print("\n[bold cyan]Scanning for emails to organize...[/]\n")
-    all_msgs = list_messages(service, query="in:inbox", max_results=500)
-    msgs_with_headers = _fetch_with_headers(service, all_msgs)
+    msgs_with_headers = _load_inbox_headers(service, cache=cache)
 
     reviewed = load_reviewed()
     to_label = [
@@ -434,9 +556,7 @@ def run_organize_only(service, config, dry_run=True):
         console.print("  [bold green]Nothing to organize.[/]")
         return
 
-    counts = {}
-    for _, label in to_label:
-        counts[label] = counts.get(label, 0) + 1
+    counts = Counter(label for _, label in to_label)
 
     table = Table(show_header=True, header_style="bold cyan")
     table.add_column("Label", style="white")
@@ -457,7 +577,7 @@ def run_organize_only(service, config, dry_run=True):
         console.print(f"[bold green]Labeled {len(to_label)} emails.[/]")
 
 
-def run_delete_old_only(service, config, dry_run=True):
+def run_delete_old_only(service, config, dry_run=True, cache=None):
     """Find and optionally trash emails older than a user-chosen threshold."""
     rules = config.get("rules", {})
     config_days = rules.get("delete_older_than_days", 90)
@@ -492,19 +612,24 @@ def run_delete_old_only(service, config, dry_run=True):
         delete_days = preset_map[age_choice]
 
     console.print(f"\n[bold cyan]Scanning for emails older than {delete_days} days...[/]\n")
-    all_msgs = list_messages(service, query=f"in:inbox older_than:{delete_days}d", max_results=500)
-    msgs_with_headers = _fetch_with_headers(service, all_msgs)
+    cache = cache or _header_cache
+    query = f"in:inbox older_than:{delete_days}d" + _priority_exclusions(priority_keywords, priority_senders)
+    msgs_with_headers = _load_inbox_headers(service, query, cache=cache)
 
+    # Still checked here: Gmail matches whole words, is_priority matches substrings
+    is_priority = priority_checker(priority_keywords, priority_senders)
     to_trash = [
         msg_id for msg_id, headers in msgs_with_headers
-        if not is_priority(headers, priority_keywords, priority_senders)
+        if not is_priority(headers)
         and not is_personal_email(headers)
     ]
-    protected = len(msgs_with_headers) - len(to_trash)
+    # Priority mail was already excluded by the query; this only counts local-only matches
+    kept = len(msgs_with_headers) - len(to_trash)
 
     console.print(
         f"  Found [bold yellow]{len(to_trash)}[/] old emails to trash "
-        f"([bold blue]{protected}[/] protected as priority)."
+        f"(priority senders and keywords excluded by the search; "
+        f"[bold blue]{kept}[/] more kept by local priority/personal match)."
     )
 
     if dry_run:
@@ -514,12 +639,12 @@ def run_delete_old_only(service, config, dry_run=True):
     to_trash = to_trash[:500]
     confirmed = questionary.confirm(f"Move {len(to_trash)} emails to Trash?", default=False).ask()
     if confirmed:
-        for msg_id in to_trash:
-            trash_message(service, msg_id)
+        batch_trash(service, to_trash)
+        cache.discard(to_trash)
         console.print(f"[bold green]Trashed {len(to_trash)} emails.[/]")
 
 
-def run_browse_and_delete(service, config):
+def run_browse_and_delete(service, config, cache=None):
     """List the last 500 inbox emails and let the user select which to delete."""
     max_trash = config.get("automation", {}).get("max_trash_per_run", 500)
     rules = config.get("rules", {})
@@ -527,27 +652,22 @@ def run_browse_and_delete(service, config):
     priority_senders = rules.get("priority_senders", [])
 
     console.print("\n[bold cyan]Loading last 500 emails...[/]\n")
-    all_msgs = list_messages(service, query="in:inbox", max_results=500)
-    msgs_with_headers = _fetch_with_headers(service, all_msgs)
+    cache = cache or _header_cache
+    msgs_with_headers = _load_inbox_headers(service, cache=cache)
 
     if not msgs_with_headers:
         console.print("  [bold green]Inbox is empty.[/]")
         return
 
     # Build display items
+    is_priority = priority_checker(priority_keywords, priority_senders)
     email_items = []
     for msg_id, headers in msgs_with_headers:
         sender = get_header(headers, "From") or "—"
         subject = get_header(headers, "Subject") or "(no subject)"
-        age = get_age_days(headers)
-        if age == 0:
-            age_str = "today    "
-        elif age == 1:
-            age_str = "yesterday"
-        else:
-            age_str = f"{age}d ago   "[:9]
+        age_str = f"{_age_label(get_age_days(headers)):<9}"[:9]
         display_sender = sender.split("<")[0].strip() or sender
-        priority = is_priority(headers, priority_keywords, priority_senders) or is_personal_email(headers)
+        priority = is_priority(headers) or is_personal_email(headers)
         email_items.append((msg_id, display_sender, subject, age_str, priority))
 
     priority_count = sum(1 for *_, p in email_items if p)
@@ -604,16 +724,16 @@ def run_browse_and_delete(service, config):
         f"Delete {len(to_delete)} selected emails?", default=False
     ).ask()
     if confirmed:
-        for msg_id in to_delete:
-            trash_message(service, msg_id)
+        batch_trash(service, to_delete)
+        cache.discard(to_delete)
         console.print(f"[bold green]Deleted {len(to_delete)} emails.[/]")
 
 
-def run_job_emails(service, config):
+def run_job_emails(service, config, cache=None):
     """Find all job-related emails in the inbox and let the user act on them."""
     console.print("\n[bold cyan]Scanning for job-related emails...[/]\n")
-    all_msgs = list_messages(service, query="in:inbox", max_results=500)
-    msgs_with_headers = _fetch_with_headers(service, all_msgs)
+    cache = cache or _header_cache
+    msgs_with_headers = _load_inbox_headers(service, cache=cache)
 
     job_items = []  # (msg_id, sender, subject, age_days)
     for msg_id, headers in msgs_with_headers:
@@ -642,13 +762,9 @@ def run_job_emails(service, config):
     table.add_column("From", style="white", max_width=30)
     table.add_column("Subject", style="bold", max_width=55)
 
-    for _, sender, subject, age in job_items:
-        if age == 0:
-            age_str = "today"
-        elif age == 1:
-            age_str = "yesterday"
-        else:
-            age_str = f"{age}d ago"
+    # Formatted once, for both the table and the pick-individually titles
+    age_strs = [_age_label(age) for *_, age in job_items]
+    for (_, sender, subject, _), age_str in zip(job_items, age_strs):
         table.add_row(age_str, sender[:30], subject[:55])
 
     console.print(table)
@@ -669,8 +785,7 @@ def run_job_emails(service, config):
         return
 
     if "Star all" in action:
-        for msg_id, _, _, _ in job_items:
-            modify_labels(service, msg_id, add_labels=["STARRED"])
+        batch_modify_labels(service, [msg_id for msg_id, _, _, _ in job_items], add_labels=["STARRED"])
         console.print(f"[bold green]Starred {len(job_items)} emails.[/]")
 
     elif "Label all" in action:
@@ -681,12 +796,11 @@ def run_job_emails(service, config):
         console.print("[dim]  All selected by default — Space = deselect   ↑↓ = navigate   Enter = confirm[/]\n")
         choices = [
             questionary.Choice(
-                title=f"{'today' if age == 0 else 'yesterday' if age == 1 else f'{age}d ago':>9}  "
-                      f"{sender[:28]:<28}  {subject[:45]}",
+                title=f"{age_strs[i]:>9}  {sender[:28]:<28}  {subject[:45]}",
                 value=i,
                 checked=True,
             )
-            for i, (_, sender, subject, age) in enumerate(job_items)
+            for i, (_, sender, subject, _) in enumerate(job_items)
         ]
         selected = questionary.checkbox(
             "Select emails to act on (uncheck any to skip):",
@@ -701,8 +815,7 @@ def run_job_emails(service, config):
         ).ask()
 
         if act == "Star":
-            for i in selected:
-                modify_labels(service, job_items[i][0], add_labels=["STARRED"])
+            batch_modify_labels(service, [job_items[i][0] for i in selected], add_labels=["STARRED"])
             console.print(f"[bold green]Starred {len(selected)} emails.[/]")
         elif act == "Label as 'Jobs'":
             _apply_labels(service, [(job_items[i][0], "Jobs") for i in selected])
@@ -710,6 +823,6 @@ def run_job_emails(service, config):
         elif act == "Delete":
             max_trash = config.get("automation", {}).get("max_trash_per_run", 500)
             to_delete = [job_items[i][0] for i in selected][:max_trash]
-            for msg_id in to_delete:
-                trash_message(service, msg_id)
+            batch_trash(service, to_delete)
+            cache.discard(to_delete)
             console.print(f"[bold green]Deleted {len(to_delete)} emails.[/]")
@@ -1,6 +1,15 @@
-from datetime import datetime, timezone
+import re
+import time
+from datetime import timezone
+from functools import lru_cache
 from email.utils import parsedate_to_datetime
 
+# Keys under which header_dict() keeps derived values (not real header names)
+DATE_EPOCH = "_date_epoch"
+_MATCH_TEXT = "_match_text"  # (lowercased Subject, lowercased From)
+
+MAX_DATE_LENGTH = 200
+
 DEFAULT_PRIORITY_KEYWORDS = [
     "job offer", "job opportunity", "interview", "we'd like to offer",
     "hiring", "salary", "annual compensation", "offer letter",
@@ -33,13 +42,66 @@ CATEGORY_RULES = [
 ]
 
 
+@lru_cache(maxsize=None)
+def _compile_terms(terms):
+    """Compile literal terms into one alternation regex (None if there are no terms).
+
+    A single search over the lowercased text replaces one substring scan per term.
+    """
+    terms = [t.lower() for t in terms if t]
+    if not terms:
+        return None
+    return re.compile("|".join(re.escape(t) for t in terms))
+
+
 def get_header(headers, name):
+    """Return a header value from a Gmail header list or a header_dict() mapping."""
+    if isinstance(headers, dict):
+        return headers.get(name.lower(), "")
     for h in headers:
         if h["name"].lower() == name.lower():
             return h["value"]
     return ""
 
 
+def header_dict(headers):
+    """Index a Gmail header list by lowercased name so each lookup is O(1).
+
+    The parsed Date is stored under DATE_EPOCH so it is computed once per
+    message at fetch time rather than on every age check.
+    """
+    # Built in reverse so the first occurrence of a repeated header wins, as in get_header
+    hdict = {h["name"].lower(): h["value"] for h in reversed(headers)}
+    hdict[DATE_EPOCH] = parse_date_epoch(hdict.get("date", ""))
+    hdict[_MATCH_TEXT] = (hdict.get("subject", "").lower(), hdict.get("from", "").lower())
+    return hdict
+
+
+def _match_text(headers):
+    """Return (subject, sender) lowercased, as every keyword predicate matches them.
+
+    header_dict() precomputes this, so the predicates don't each lowercase
+    the same strings again.
+    """
+    if isinstance(headers, dict) and _MATCH_TEXT in headers:
+        return headers[_MATCH_TEXT]
+    return get_header(headers, "Subject").lower(), get_header(headers, "From").lower()
+
+
+def parse_date_epoch(date_str):
+    """Return a Date header as a UTC epoch timestamp, or None if missing or unparseable."""
+    # Real Date headers are ~30 characters; padded junk can make the parser crawl (bpo-42909)
+    if not date_str or len(date_str) > MAX_DATE_LENGTH:
+        return None
+    try:
+        msg_date = parsedate_to_datetime(date_str)
+        if msg_date.tzinfo is None:
+            msg_date = msg_date.replace(tzinfo=timezone.utc)
+        return msg_date.timestamp()
+    except Exception:
+        return None
+
+
 _JOB_EMAIL_KEYWORDS = [
     # Recruiter outreach
     "recruiter", "recruiting", "talent acquisition", "i came across your profile",
@@ -67,16 +129,14 @@ _JOB_EMAIL_SENDERS = [
     "jobvite", "smartrecruiters", "icims", "taleo", "wellfound",
 ]
 
+_JOB_EMAIL_RE = _compile_terms(tuple(_JOB_EMAIL_KEYWORDS + _JOB_EMAIL_SENDERS))
+
 
 def is_job_email(headers) -> bool:
     """Return True if the email looks job/career related."""
-    subject = get_header(headers, "Subject").lower()
-    sender = get_header(headers, "From").lower()
+    subject, sender = _match_text(headers)
     combined = subject + " " + sender
-    return (
-        any(k in combined for k in _JOB_EMAIL_KEYWORDS)
-        or any(s in combined for s in _JOB_EMAIL_SENDERS)
-    )
+    return _JOB_EMAIL_RE.search(combined) is not None
 
 
 def is_newsletter(headers):
@@ -91,6 +151,7 @@ _AUTOMATED_SENDER_PATTERNS = [
     "support@", "hello@", "info@", "team@", "accounts@",
     "update@", "updates@", "service@", "system@",
 ]
+_AUTOMATED_SENDER_RE = _compile_terms(tuple(_AUTOMATED_SENDER_PATTERNS))
 
 
 def is_personal_email(headers) -> bool:
@@ -107,44 +168,55 @@ def is_personal_email(headers) -> bool:
         return False
 
     # Sender looks automated
-    sender = get_header(headers, "From").lower()
-    if any(p in sender for p in _AUTOMATED_SENDER_PATTERNS):
+    _, sender = _match_text(headers)
+    if _AUTOMATED_SENDER_RE.search(sender):
         return False
 
     return True
 
 
 def is_priority(headers, extra_keywords=None, priority_senders=None):
-    keywords = DEFAULT_PRIORITY_KEYWORDS + (extra_keywords or [])
-    senders = [s.lower() for s in (priority_senders or []) if s]
+    return priority_checker(extra_keywords, priority_senders)(headers)
 
-    subject = get_header(headers, "Subject").lower()
-    sender = get_header(headers, "From").lower()
 
-    if any(s in sender for s in senders):
-        return True
-    return any(k.lower() in subject for k in keywords)
+def priority_checker(extra_keywords=None, priority_senders=None):
+    """Return an is_priority(headers) test with the config's patterns resolved once.
+
+    Use this in loops instead of passing the same config lists for every email.
+    """
+    keywords = _compile_terms(tuple(DEFAULT_PRIORITY_KEYWORDS) + tuple(extra_keywords or ()))
+    senders = _compile_terms(tuple(priority_senders or ()))
+
+    def check(headers):
+        subject, sender = _match_text(headers)
+        if senders and senders.search(sender):
+            return True
+        return keywords.search(subject) is not None
+
+    return check
 
 
 def categorize(headers):
-    subject = get_header(headers, "Subject").lower()
-    sender = get_header(headers, "From").lower()
+    subject, sender = _match_text(headers)
     combined = subject + " " + sender
 
-    for keywords, label in CATEGORY_RULES:
-        if any(k in combined for k in keywords):
+    # One compiled pattern per rule, tried in order so the first matching rule still wins
+    for pattern, label in _category_patterns():
+        if pattern.search(combined):
             return label
     return None
 
 
+@lru_cache(maxsize=None)
+def _category_patterns():
+    return [(_compile_terms(tuple(keywords)), label) for keywords, label in CATEGORY_RULES]
+
+
 def get_age_days(headers):
-    date_str = get_header(headers, "Date")
-    if not date_str:
-        return 0
-    try:
-        msg_date = parsedate_to_datetime(date_str)
-        if msg_date.tzinfo is None:
-            msg_date = msg_date.replace(tzinfo=timezone.utc)
-        return (datetime.now(timezone.utc) - msg_date).days
-    except Exception:
+    if isinstance(headers, dict) and DATE_EPOCH in headers:
+        epoch = headers[DATE_EPOCH]
+    else:
+        epoch = parse_date_epoch(get_header(headers, "Date"))
+    if epoch is None:
         return 0
+    return int((time.time() - epoch) // 86400)
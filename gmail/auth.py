@@ -5,6 +5,11 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from rich.console import Console
 
+from gmail.client import forget_all_labels
+from gmail.history import clear_snapshot
+from gmail.message_cache import clear_cache
+from gmail.state import write_atomic
+
 SCOPES = ["https://www.googleapis.com/auth/gmail.modify"]
 TOKEN_FILE = "token.json"
 CREDENTIALS_FILE = "credentials.json"
@@ -41,14 +46,18 @@ def get_credentials():
             )
             creds = flow.run_local_server(port=0, open_browser=False)
 
-        with open(TOKEN_FILE, "w") as f:
-            f.write(creds.to_json())
+        # A corrupt token would force a full browser sign-in next time
+        write_atomic(TOKEN_FILE, creds.to_json())
 
     return creds
 
 
 def signout():
-    """Delete the local token file, requiring re-authentication on next run."""
+    """Delete the local token and cached account data, requiring re-authentication on next run."""
+    # Label IDs, the inbox snapshot and cached headers all belong to this account
+    forget_all_labels()
+    clear_snapshot()
+    clear_cache()
     if os.path.exists(TOKEN_FILE):
         os.remove(TOKEN_FILE)
         console.print("[bold green]Signed out.[/] Local token deleted.")
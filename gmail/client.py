@@ -1,24 +1,112 @@
+import base64
+import queue
+import random
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from email.mime.text import MIMEText
+from itertools import islice
 
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
+from gmail.state import clear_label_ids, load_label_ids, save_label_ids
+
+BATCH_SIZE = 100  # Gmail caps batch requests at 100 calls
+BATCH_MODIFY_SIZE = 1000  # messages.batchModify accepts up to 1000 IDs
+FETCH_WORKERS = 10  # keeps parallel fetches under Gmail's 250 quota-units/sec
+BATCH_WORKERS = 4  # concurrent batch calls; more mostly buys 429s
+RETRY_STATUSES = {429, 500, 502, 503, 504}  # rate limited or transient server error
+RATE_LIMIT_REASONS = ("userRateLimitExceeded", "rateLimitExceeded")  # Gmail sends these as 403s
+MAX_BACKOFF = 32
+QUOTA_UNITS_PER_MINUTE = 15000  # Gmail's per-user limit; a 429 costs a round trip and a backoff
+
+# Quota units each call costs, from Gmail's usage limits table
+UNITS = {
+    "messages.get": 5, "messages.list": 5, "messages.send": 100,
+    "messages.trash": 5, "messages.batchModify": 50,
+    "getProfile": 1, "history.list": 2, "labels.list": 1, "labels.create": 5,
+}
+
+# Only the headers the analyzers actually read — keeps responses small
+METADATA_HEADERS = [
+    "Subject", "From", "Date",
+    "List-Unsubscribe", "List-Unsubscribe-Post", "List-Id",
+    "Precedence", "Message-ID",
+]
+
+_label_ids = {}  # lowercased label name -> label ID, for the signed-in account
 
 
 def build_service(creds):
     return build("gmail", "v1", credentials=creds)
 
 
-def _retry(fn, retries=3, delay=2):
-    """Call fn(), retrying on network errors up to `retries` times."""
+class _QuotaBucket:
+    """Token bucket over Gmail's per-user quota: callers block until their units are available.
+
+    Starts full, so ordinary runs never wait; only sustained bulk work is paced.
+    """
+
+    def __init__(self, units_per_minute):
+        self._rate = units_per_minute / 60
+        self._capacity = self._tokens = units_per_minute
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, units):
+        units = min(units, self._capacity)  # a bigger request could never be satisfied
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+                self._updated = now
+                if self._tokens >= units:
+                    self._tokens -= units
+                    return
+                deficit = units - self._tokens
+            # Sleep outside the lock so other threads can still refill and take units meanwhile
+            time.sleep(deficit / self._rate)
+
+
+_quota = _QuotaBucket(QUOTA_UNITS_PER_MINUTE)
+
+
+def _retry(fn, units=0, retries=5):
+    """Call fn(), retrying rate-limit, server and network errors with exponential backoff.
+
+    `units` is the call's quota cost, taken from the bucket before every attempt
+    since failed attempts count against the quota too.
+    """
     for attempt in range(retries):
+        _quota.consume(units)
         try:
             return fn()
         except Exception as e:
-            if attempt < retries - 1 and _is_network_error(e):
-                time.sleep(delay * (attempt + 1))
+            if attempt < retries - 1 and _is_retryable(e):
+                time.sleep(_retry_after(e) or min(2 ** attempt + random.random(), MAX_BACKOFF))
             else:
                 raise
 
 
+def _is_retryable(e):
+    if isinstance(e, HttpError):
+        if e.resp.status == 403:
+            return any(reason in str(e.content) for reason in RATE_LIMIT_REASONS)
+        return e.resp.status in RETRY_STATUSES
+    return _is_network_error(e)
+
+
+def _retry_after(e):
+    """Seconds the server asked us to wait via Retry-After, or None."""
+    if not isinstance(e, HttpError):
+        return None
+    try:
+        return min(float(e.resp.get("retry-after")), MAX_BACKOFF)
+    except (TypeError, ValueError):
+        return None
+
+
 def _is_network_error(e):
     msg = str(e).lower()
     return any(k in msg for k in (
@@ -27,62 +115,249 @@ def _is_network_error(e):
     ))
 
 
-def list_messages(service, query="", max_results=500):
-    """Return a list of message dicts (id, threadId) matching the query."""
-    messages = []
+def clone_service(service):
+    """Build an independent service on the same credentials, for use from another thread."""
+    return build_service(service._http.credentials)
+
+
+def per_thread_service(service):
+    """Return a function that gives each calling thread its own clone of service."""
+    local = threading.local()
+
+    def _get():
+        if not hasattr(local, "service"):
+            local.service = clone_service(service)
+        return local.service
+
+    return _get
+
+
+def iter_message_pages(service, query="", max_results=500, page_size=500):
+    """Yield pages (lists of id/threadId dicts) of messages matching the query."""
+    remaining = max_results
     request = service.users().messages().list(
-        userId="me", q=query, maxResults=min(max_results, 500)
+        userId="me", q=query, maxResults=min(max_results, page_size)
     )
-    while request is not None and len(messages) < max_results:
-        response = _retry(request.execute)
-        messages.extend(response.get("messages", []))
+    while request is not None and remaining > 0:
+        response = _retry(request.execute, UNITS["messages.list"])
+        page = response.get("messages", [])[:remaining]
+        remaining -= len(page)
+        if page:
+            yield page
         request = service.users().messages().list_next(request, response)
-    return messages[:max_results]
 
 
-def get_message_metadata(service, msg_id):
-    """Fetch a message with only the headers we care about (fast, low quota)."""
-    return _retry(lambda: service.users().messages().get(
+def list_messages(service, query="", max_results=500):
+    """Return a list of message dicts (id, threadId) matching the query."""
+    return [msg for page in iter_message_pages(service, query, max_results) for msg in page]
+
+
+def stream_message_pages(service, query="", max_results=500):
+    """Yield pages of matching messages while later pages are still being listed.
+
+    Pages are as large as messages.list allows, so a 500-message scan is one
+    list call; callers split them into BATCH_SIZE batches. Listing runs in a
+    background thread on its own service, so the caller can fetch metadata for
+    one page while the next one is in flight.
+    """
+    pages = queue.Queue()
+
+    def _produce():
+        try:
+            for page in iter_message_pages(clone_service(service), query, max_results):
+                pages.put(page)
+        finally:
+            pages.put(None)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        lister = pool.submit(_produce)
+        while (page := pages.get()) is not None:
+            yield page
+        lister.result()  # surface listing errors
+
+
+def _metadata_request(service, msg_id):
+    return service.users().messages().get(
         userId="me",
         id=msg_id,
         format="metadata",
-        metadataHeaders=[
-            "Subject", "From", "To", "Date",
-            "List-Unsubscribe", "List-Unsubscribe-Post", "List-Id",
-            "Precedence", "Message-ID",
-        ],
-    ).execute())
+        metadataHeaders=METADATA_HEADERS,
+    )
+
+
+def get_message_metadata(service, msg_id):
+    """Fetch a message with only the headers we care about (fast, low quota)."""
+    return _retry(_metadata_request(service, msg_id).execute, UNITS["messages.get"])
+
+
+def batch_get_metadata(service, msg_ids):
+    """Fetch metadata for up to BATCH_SIZE messages in a single HTTP round trip.
+
+    Returns a dict of msg_id -> message. Messages whose sub-request failed
+    are left out so the caller can retry them individually.
+    """
+    results = {}
+
+    def _collect(request_id, response, exception):
+        if exception is None:
+            results[request_id] = response
+
+    batch = service.new_batch_http_request(callback=_collect)
+    for msg_id in msg_ids:
+        batch.add(_metadata_request(service, msg_id), request_id=msg_id)
+    _retry(batch.execute, UNITS["messages.get"] * len(msg_ids))
+    return results
+
+
+def fetch_metadata_concurrently(thread_service, msg_ids, pool):
+    """Fetch metadata for msg_ids one request each, spread over pool.
+
+    Fallback for when batching is unavailable. The pool is the caller's, so
+    concurrent batches share one bound of FETCH_WORKERS threads. httplib2 is
+    not thread-safe, so thread_service (see per_thread_service) must give
+    each pool thread its own service. Returns a dict of msg_id -> message.
+    """
+    def _fetch(msg_id):
+        return msg_id, get_message_metadata(thread_service(), msg_id)
+
+    return dict(pool.map(_fetch, msg_ids))
 
 
 def send_message(service, to, subject="", body=""):
     """Send a plain-text email from the authenticated account."""
-    import base64
-    from email.mime.text import MIMEText
     msg = MIMEText(body)
     msg["to"] = to
     msg["subject"] = subject
     raw = base64.urlsafe_b64encode(msg.as_bytes()).decode()
-    _retry(lambda: service.users().messages().send(userId="me", body={"raw": raw}).execute())
+    _retry(lambda: service.users().messages().send(userId="me", body={"raw": raw}).execute(), UNITS["messages.send"])
 
 
 def trash_message(service, msg_id):
-    _retry(lambda: service.users().messages().trash(userId="me", id=msg_id).execute())
+    _retry(lambda: service.users().messages().trash(userId="me", id=msg_id).execute(), UNITS["messages.trash"])
+
+
+def _execute_batched(service, requests, units):
+    """Execute (request_id, request) pairs, BATCH_SIZE per HTTP call, each costing `units`.
+
+    Returns the set of request IDs whose sub-request failed.
+    """
+    failed = set()
+
+    def _collect(request_id, response, exception):
+        if exception is not None:
+            failed.add(request_id)
+
+    requests = iter(requests)
+    while chunk := list(islice(requests, BATCH_SIZE)):
+        batch = service.new_batch_http_request(callback=_collect)
+        for request_id, request in chunk:
+            batch.add(request, request_id=request_id)
+        _retry(batch.execute, units * len(chunk))
+    return failed
+
 
+def batch_trash(service, msg_ids):
+    """Move messages to Trash, BATCH_MODIFY_SIZE per call via messages.batchModify.
 
-def modify_labels(service, msg_id, add_labels=None, remove_labels=None):
+    If the account rejects TRASH as a batchModify label, falls back to
+    batched messages.trash calls, retrying failures one by one.
+    """
+    try:
+        batch_modify_labels(service, msg_ids, add_labels=["TRASH"])
+        return
+    except HttpError as e:
+        if e.resp.status != 400:
+            raise
+    messages = service.users().messages()
+    failed = _execute_batched(service, (
+        (msg_id, messages.trash(userId="me", id=msg_id))
+        for msg_id in dict.fromkeys(msg_ids)
+    ), UNITS["messages.trash"])
+    for msg_id in failed:
+        trash_message(service, msg_id)
+
+
+def batch_modify_labels(service, msg_ids, add_labels=None, remove_labels=None):
+    """Apply the same label change to many messages via messages.batchModify."""
     body = {}
     if add_labels:
         body["addLabelIds"] = add_labels
     if remove_labels:
         body["removeLabelIds"] = remove_labels
-    _retry(lambda: service.users().messages().modify(userId="me", id=msg_id, body=body).execute())
+    msg_ids = iter(dict.fromkeys(msg_ids))
+    while chunk := list(islice(msg_ids, BATCH_MODIFY_SIZE)):
+        _retry(lambda: service.users().messages().batchModify(
+            userId="me", body={**body, "ids": chunk},
+        ).execute(), UNITS["messages.batchModify"])
+
+
+def get_profile(service):
+    """Return the account profile (emailAddress, historyId, ...)."""
+    return _retry(lambda: service.users().getProfile(userId="me").execute(), UNITS["getProfile"])
+
+
+def list_history(service, start_history_id):
+    """Return every mailbox history record since start_history_id, oldest first."""
+    records = []
+    request = service.users().history().list(userId="me", startHistoryId=start_history_id)
+    while request is not None:
+        response = _retry(request.execute, UNITS["history.list"])
+        records.extend(response.get("history", []))
+        request = service.users().history().list_next(request, response)
+    return records
 
 
 def get_or_create_label(service, name):
-    """Return the label ID for `name`, creating the label if it doesn't exist."""
-    labels = _retry(lambda: service.users().labels().list(userId="me").execute()).get("labels", [])
-    for label in labels:
-        if label["name"].lower() == name.lower():
-            return label["id"]
-    result = _retry(lambda: service.users().labels().create(userId="me", body={"name": name}).execute())
+    """Return the label ID for `name`, creating the label if it doesn't exist.
+
+    IDs are cached for the life of the process, so repeat calls from
+    different actions cost no extra round trips.
+    """
+    return resolve_labels(service, [name])[name]
+
+
+def resolve_labels(service, names):
+    """Return {name: label ID} for names, creating missing labels.
+
+    IDs saved by earlier runs are reused; everything else is resolved from a
+    single labels.list call and saved for next time.
+    """
+    uncached = [name for name in names if name.lower() not in _label_ids]
+    if uncached:
+        saved = load_label_ids()
+        for name in uncached:
+            if name.lower() in saved:
+                _label_ids[name.lower()] = saved[name.lower()]
+        uncached = [name for name in uncached if name.lower() not in saved]
+    if uncached:
+        existing = {label["name"].lower(): label["id"] for label in _list_labels(service)}
+        for name in uncached:
+            if name.lower() not in _label_ids:
+                _label_ids[name.lower()] = existing.get(name.lower()) or _create_label(service, name)
+                saved[name.lower()] = _label_ids[name.lower()]
+        save_label_ids(saved)
+    return {name: _label_ids[name.lower()] for name in names}
+
+
+def forget_label(name):
+    """Drop a cached label ID, e.g. after Gmail rejects it because the label was deleted."""
+    _label_ids.pop(name.lower(), None)
+    saved = load_label_ids()
+    if saved.pop(name.lower(), None) is not None:
+        save_label_ids(saved)
+
+
+def forget_all_labels():
+    """Drop every cached label ID, in memory and on disk; label IDs belong to one account."""
+    _label_ids.clear()
+    clear_label_ids()
+
+
+def _list_labels(service):
+    return _retry(lambda: service.users().labels().list(userId="me").execute(), UNITS["labels.list"]).get("labels", [])
+
+
+def _create_label(service, name):
+    result = _retry(lambda: service.users().labels().create(userId="me", body={"name": name}).execute(), UNITS["labels.create"])
     return result["id"]
+
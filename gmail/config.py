@@ -0,0 +1,11 @@
+"""Loading config.yaml, shared by the CLI and the scheduler."""
+
+import yaml
+
+CONFIG_FILE = "config.yaml"
+
+
+def load_config(path=CONFIG_FILE):
+    with open(path) as f:
+        # libyaml's loader when PyYAML was built with it; same safe subset either way
+        return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
@@ -1,8 +1,49 @@
-from collections import defaultdict
-from datetime import timezone
-from email.utils import parsedate_to_datetime
+from gmail.analyzer import DATE_EPOCH, get_header, parse_date_epoch
 
-from gmail.analyzer import get_header
+
+def duplicate_key(headers):
+    """Return the key two emails must share to count as duplicates.
+
+    Same Message-ID is a definitive match. Emails without one fall back to
+    sender + subject + date rounded to the minute.
+    """
+    mid = get_header(headers, "Message-ID").strip()
+    if mid:
+        return "id", mid
+    if isinstance(headers, dict) and DATE_EPOCH in headers:
+        epoch = headers[DATE_EPOCH]
+    else:
+        epoch = parse_date_epoch(get_header(headers, "Date"))
+    minute = "" if epoch is None else int(epoch // 60)
+    return "fuzzy", (get_header(headers, "From"), get_header(headers, "Subject"), minute)
+
+
+class DuplicateTracker:
+    """Collects duplicate groups one message at a time, so it can ride along another loop.
+
+    Most keys are unique, so a key only costs a dict slot until it repeats;
+    the list of repeats is allocated on the second hit. Groups come out in
+    the order their first message was seen, as find_duplicates always did.
+    """
+
+    def __init__(self):
+        self._first_seen = {}  # key -> first message ID, in first-seen order
+        self._repeats = {}  # key -> later message IDs, only for keys seen twice
+
+    def add(self, msg_id, headers):
+        key = duplicate_key(headers)
+        if key not in self._first_seen:
+            self._first_seen[key] = msg_id
+        else:
+            self._repeats.setdefault(key, []).append(msg_id)
+
+    def groups(self):
+        """Message-ID groups first, then fuzzy ones; the first ID in each group is kept."""
+        groups = {"id": [], "fuzzy": []}
+        for key, first in self._first_seen.items():
+            if key in self._repeats:
+                groups[key[0]].append([first] + self._repeats[key])
+        return groups["id"] + groups["fuzzy"]
 
 
 def find_duplicates(messages_with_headers):
@@ -14,32 +55,7 @@ def find_duplicates(messages_with_headers):
     Returns a list of groups, where each group is a list of message IDs.
     The first ID in each group is kept; the rest are considered duplicates.
     """
-    by_message_id = defaultdict(list)
-    no_message_id = []
-
+    tracker = DuplicateTracker()
     for msg_id, headers in messages_with_headers:
-        mid = get_header(headers, "Message-ID").strip()
-        if mid:
-            by_message_id[mid].append(msg_id)
-        else:
-            no_message_id.append((msg_id, headers))
-
-    groups = [ids for ids in by_message_id.values() if len(ids) > 1]
-
-    # Fuzzy match for emails missing Message-ID
-    fuzzy = defaultdict(list)
-    for msg_id, headers in no_message_id:
-        sender = get_header(headers, "From")
-        subject = get_header(headers, "Subject")
-        date_str = get_header(headers, "Date")
-        try:
-            dt = parsedate_to_datetime(date_str)
-            if dt.tzinfo is None:
-                dt = dt.replace(tzinfo=timezone.utc)
-            key = (sender, subject, dt.replace(second=0, microsecond=0))
-        except Exception:
-            key = (sender, subject, "")
-        fuzzy[key].append(msg_id)
-
-    groups += [ids for ids in fuzzy.values() if len(ids) > 1]
-    return groups
+        tracker.add(msg_id, headers)
+    return tracker.groups()
@@ -0,0 +1,110 @@
+"""Incremental inbox sync: replay Gmail history onto the last saved inbox snapshot."""
+
+import json
+import os
+
+from googleapiclient.errors import HttpError
+
+from gmail.client import get_profile, list_history, list_messages, stream_message_pages
+from gmail.state import write_atomic
+
+SNAPSHOT_FILE = "inbox_snapshot.json"
+INBOX_QUERY = "in:inbox"
+
+
+def sync_inbox(service, max_results, fetch, profile=None):
+    """Return (msg_id, headers) rows for the inbox, fetching only what changed since last run.
+
+    fetch(service, pages) is the same batched fetcher used for a full scan.
+    profile is a fresh getProfile() result, if the caller already has one.
+    Falls back to a full scan when there is no usable snapshot or the
+    history has expired.
+    """
+    profile = profile or get_profile(service)
+    snapshot = _load_snapshot()
+    rows = None
+    if (
+        snapshot
+        and snapshot.get("email") == profile.get("emailAddress")
+        and snapshot.get("max_results") == max_results
+    ):
+        rows = _replay_history(service, snapshot, max_results, fetch)
+    if rows is None:
+        rows = fetch(service, stream_message_pages(service, INBOX_QUERY, max_results))
+    # historyId read before listing, so anything that changed meanwhile is replayed next run
+    _save_snapshot(profile, max_results, rows)
+    return rows
+
+
+def _replay_history(service, snapshot, max_results, fetch):
+    try:
+        records = list_history(service, snapshot["history_id"])
+    except HttpError as e:
+        if e.resp.status == 404:  # history expired — too long since the last run
+            return None
+        raise
+
+    # Last change wins: does each touched message end up in the inbox or not?
+    in_inbox = {}
+    arrived = set()
+    for record in records:
+        for change in record.get("messagesAdded", []):
+            arrived.add(change["message"]["id"])
+        for kind in ("messagesAdded", "labelsAdded", "labelsRemoved"):
+            for change in record.get(kind, []):
+                labels = change["message"].get("labelIds", [])
+                in_inbox[change["message"]["id"]] = (
+                    "INBOX" in labels and "TRASH" not in labels and "SPAM" not in labels
+                )
+        for change in record.get("messagesDeleted", []):
+            in_inbox[change["message"]["id"]] = False
+
+    rows = [tuple(row) for row in snapshot["messages"]]
+    known = {msg_id for msg_id, _ in rows}
+    added = [msg_id for msg_id, now_in in in_inbox.items() if now_in and msg_id not in known]
+    removed = {msg_id for msg_id, now_in in in_inbox.items() if not now_in and msg_id in known}
+    kept = [row for row in rows if row[0] not in removed]
+
+    # Re-inboxed old mail belongs somewhere in the middle of the listing, and
+    # removals from a full snapshot (e.g. our own trashing) leave a gap at the end
+    if any(msg_id not in arrived for msg_id in added) or (removed and len(rows) >= max_results):
+        return _backfill(service, kept, max_results, fetch)
+
+    new_rows = fetch(service, [[{"id": msg_id} for msg_id in reversed(added)]]) if added else []
+    return (new_rows + kept)[:max_results]
+
+
+def _backfill(service, rows, max_results, fetch):
+    """Relist the inbox IDs and fetch headers only for messages not already in rows."""
+    headers_by_id = dict(rows)
+    listing = [msg["id"] for msg in list_messages(service, INBOX_QUERY, max_results)]
+    missing = [msg_id for msg_id in listing if msg_id not in headers_by_id]
+    if missing:
+        headers_by_id.update(fetch(service, [[{"id": msg_id} for msg_id in missing]]))
+    return [(msg_id, headers_by_id[msg_id]) for msg_id in listing]
+
+
+def _load_snapshot():
+    if not os.path.exists(SNAPSHOT_FILE):
+        return None
+    with open(SNAPSHOT_FILE) as f:
+        try:
+            return json.load(f)
+        except (json.JSONDecodeError, ValueError):
+            return None
+
+
+def _save_snapshot(profile, max_results, rows):
+    write_atomic(SNAPSHOT_FILE, json.dumps({
+        "email": profile.get("emailAddress"),
+        "history_id": profile.get("historyId"),
+        "max_results": max_results,
+        "messages": rows,
+    }))
+
+
+def clear_snapshot():
+    """Delete the saved inbox snapshot; it holds the signed-in account's headers."""
+    for path in (SNAPSHOT_FILE, SNAPSHOT_FILE + ".tmp"):
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,112 @@
+"""In-process cache of fetched inbox headers, shared across run_* actions."""
+
+import threading
+from concurrent.futures import Future
+from functools import partial
+
+from gmail.client import get_profile, stream_message_pages
+from gmail.history import INBOX_QUERY, sync_inbox
+
+
+class PrefetchCancelled(Exception):
+    """Raised inside a background prefetch that is no longer wanted."""
+
+
+class HeaderCache:
+    """Memoizes (query, max_results) -> [(msg_id, headers), ...] while the mailbox is unchanged."""
+
+    def __init__(self):
+        self._entries = {}
+        self._pending = {}  # key -> (Future, stop Event) of a background prefetch
+        self._history_ids = {}  # key -> mailbox historyId the entry reflects
+
+    def get(self, service, query, max_results, fetch):
+        """Return headers for messages matching query, listing and fetching only on a miss.
+
+        fetch(service, pages) receives the listing as an iterable of message pages.
+        If a prefetch for the same query is running, this waits for it instead;
+        prefetches for other queries are cancelled, and a failed one is simply
+        loaded again here. Any cached entry is reloaded if the mailbox changed
+        since it was loaded (the inbox incrementally, via its snapshot).
+        """
+        key = (query, max_results)
+        self.cancel_prefetch(keep=key)
+        if key in self._pending:
+            future, _ = self._pending.pop(key)
+            try:
+                self._entries[key] = future.result()
+            except Exception:
+                pass
+        profile = None
+        if key in self._entries:
+            profile = get_profile(service)
+            if profile.get("historyId") != self._history_ids.get(key):
+                del self._entries[key]
+        if key not in self._entries:
+            self._entries[key] = self._load(service, query, max_results, fetch, profile)
+        return self._entries[key]
+
+    def prefetch(self, service, query, max_results, fetch):
+        """Start loading query on a background thread so a later get() finds it ready.
+
+        service must not be used by any other thread (httplib2 is not thread-safe).
+        fetch also gets a `stop` Event, set by cancel_prefetch(); it should stop
+        issuing requests and raise PrefetchCancelled once that is set. The thread
+        is a daemon, so quitting the app doesn't wait for it.
+        """
+        key = (query, max_results)
+        if key in self._entries or key in self._pending:
+            return
+        future, stop = Future(), threading.Event()
+
+        def _run():
+            try:
+                future.set_result(self._load(service, query, max_results, partial(fetch, stop=stop)))
+            except BaseException as e:
+                future.set_exception(e)
+
+        self._pending[key] = (future, stop)
+        threading.Thread(target=_run, name="inbox-prefetch", daemon=True).start()
+
+    def cancel_prefetch(self, keep=None, wait=False):
+        """Stop background prefetches (except the one for key `keep`) and forget them.
+
+        With wait, also block until they have finished, so nothing they would
+        still write (snapshot, header cache) lands after the caller moves on.
+        """
+        stopped = []
+        for key in [key for key in self._pending if key != keep]:
+            future, stop = self._pending.pop(key)
+            stop.set()
+            stopped.append(future)
+        if wait:
+            for future in stopped:
+                try:
+                    future.result()
+                except Exception:
+                    pass
+
+    def _load(self, service, query, max_results, fetch, profile=None):
+        # historyId read before listing, so anything that changes meanwhile invalidates the entry
+        profile = profile or get_profile(service)
+        if query == INBOX_QUERY:
+            # The plain inbox listing can be synced incrementally from the last run
+            rows = sync_inbox(service, max_results, fetch, profile)
+        else:
+            rows = fetch(service, stream_message_pages(service, query, max_results))
+        self._history_ids[(query, max_results)] = profile.get("historyId")
+        return rows
+
+    def discard(self, msg_ids):
+        """Forget messages that were trashed so later scans don't offer them again."""
+        gone = set(msg_ids)
+        if not gone:
+            return
+        for key, rows in self._entries.items():
+            self._entries[key] = [row for row in rows if row[0] not in gone]
+
+    def clear(self):
+        """Forget everything, e.g. before signout: the cached headers belong to the account."""
+        self.cancel_prefetch(wait=True)
+        self._entries.clear()
+        self._history_ids.clear()
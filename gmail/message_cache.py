@@ -0,0 +1,62 @@
+"""Persistent per-message header cache: Gmail headers never change once delivered."""
+
+import json
+import os
+import sqlite3
+
+from gmail.client import METADATA_HEADERS
+
+CACHE_FILE = "headers_cache.db"
+
+# Rows fetched with a different header set are stale, so the cache is keyed on it
+_FIELDS = ",".join(METADATA_HEADERS)
+
+
+def _connect():
+    conn = sqlite3.connect(CACHE_FILE)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+    conn.execute("CREATE TABLE IF NOT EXISTS headers (id TEXT PRIMARY KEY, json TEXT)")
+    row = conn.execute("SELECT value FROM meta WHERE key = 'fields'").fetchone()
+    if row is None or row[0] != _FIELDS:
+        with conn:
+            conn.execute("DELETE FROM headers")
+            conn.execute("INSERT OR REPLACE INTO meta VALUES ('fields', ?)", (_FIELDS,))
+    return conn
+
+
+def get_cached(msg_ids) -> dict:
+    """Return {msg_id: headers} for whichever of msg_ids are cached."""
+    msg_ids = list(msg_ids)
+    found = {}
+    conn = _connect()
+    try:
+        # Stay well under SQLite's bound-parameter limit
+        for i in range(0, len(msg_ids), 500):
+            chunk = msg_ids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            for msg_id, blob in conn.execute(f"SELECT id, json FROM headers WHERE id IN ({marks})", chunk):
+                found[msg_id] = json.loads(blob)
+    finally:
+        conn.close()
+    return found
+
+
+def put_many(rows) -> None:
+    """Store (msg_id, headers) rows."""
+    rows = [(msg_id, json.dumps(headers)) for msg_id, headers in rows]
+    if not rows:
+        return
+    conn = _connect()
+    try:
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO headers VALUES (?, ?)", rows)
+    finally:
+        conn.close()
+
+
+def clear_cache() -> None:
+    """Delete the cache files; they hold the signed-in account's senders and subjects."""
+    for path in (CACHE_FILE, CACHE_FILE + "-wal", CACHE_FILE + "-shm"):
+        if os.path.exists(path):
+            os.remove(path)
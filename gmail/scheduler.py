@@ -2,9 +2,9 @@ import logging
 import time
 
 import schedule
-import yaml
 
 from gmail.auth import get_credentials
+from gmail.config import load_config
 from gmail.client import build_service
 from gmail.actions import run_cleanup
 
@@ -15,15 +15,13 @@ logging.basicConfig(
 )
 
 
-def _load_config():
-    with open("config.yaml") as f:
-        return yaml.safe_load(f)
+MAX_SLEEP_SECONDS = 3600
 
 
 def _scheduled_run():
     logging.info("Starting scheduled cleanup run")
     try:
-        config = _load_config()
+        config = load_config()
         creds = get_credentials()
         service = build_service(creds)
         run_cleanup(service, config, dry_run=False)
@@ -45,4 +43,7 @@ def start_scheduler(config):
 
     while True:
         schedule.run_pending()
-        time.sleep(60)
+        # Sleep until the next job instead of polling every minute. Capped, because
+        # time.sleep doesn't count time spent suspended and would overshoot after a laptop wakes.
+        idle = schedule.idle_seconds()
+        time.sleep(min(max(idle, 1), MAX_SLEEP_SECONDS))
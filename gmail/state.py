@@ -1,26 +1,48 @@
-"""Persistent review-state: tracks message IDs the user has already handled."""
+"""Persistent local state: message IDs the user has already handled, and known label IDs."""
 
 import json
 import os
 
+
+def write_atomic(path, text) -> None:
+    """Replace the file at path with text.
+
+    Written to a temp file and renamed over the original, so an interrupted save
+    leaves the old file intact instead of a truncated one.
+    """
+    tmp_file = path + ".tmp"
+    with open(tmp_file, "w") as f:
+        f.write(text)
+    os.replace(tmp_file, path)
+
+
 REVIEWED_FILE = "reviewed.json"
 
 
 def load_reviewed() -> set:
     if not os.path.exists(REVIEWED_FILE):
         return set()
+    reviewed = set()
     with open(REVIEWED_FILE) as f:
-        try:
-            return set(json.load(f))
-        except (json.JSONDecodeError, ValueError):
-            return set()
+        # One JSON list per line; the older single-list format is just the first line
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                reviewed.update(json.loads(line))
+            except (json.JSONDecodeError, ValueError):
+                continue
+    return reviewed
 
 
 def mark_reviewed(ids) -> None:
-    existing = load_reviewed()
-    existing.update(ids)
-    with open(REVIEWED_FILE, "w") as f:
-        json.dump(sorted(existing), f)
+    """Append ids in one write instead of re-reading and rewriting the whole history."""
+    ids = list(ids)
+    if not ids:
+        return
+    with open(REVIEWED_FILE, "a") as f:
+        # Leading newline, so the first append after an old-format file starts a new line
+        f.write("\n" + json.dumps(ids))
 
 
 def clear_reviewed() -> None:
@@ -30,3 +52,27 @@ def clear_reviewed() -> None:
 
 def count_reviewed() -> int:
     return len(load_reviewed())
+
+
+LABELS_FILE = "labels.json"
+
+
+def load_label_ids() -> dict:
+    """Return the {lowercased label name: label ID} map saved by earlier runs."""
+    if not os.path.exists(LABELS_FILE):
+        return {}
+    with open(LABELS_FILE) as f:
+        try:
+            return dict(json.load(f))
+        except (json.JSONDecodeError, ValueError, TypeError):
+            return {}
+
+
+def save_label_ids(label_ids) -> None:
+    with open(LABELS_FILE, "w") as f:
+        json.dump(label_ids, f)
+
+
+def clear_label_ids() -> None:
+    if os.path.exists(LABELS_FILE):
+        os.remove(LABELS_FILE)
@@ -122,9 +122,11 @@ class ResultsScreen(Screen):
     def on_mount(self) -> None:
         table = self.query_one(DataTable)
         table.add_columns("Action", "Count")
-        table.add_row("Trashed", str(self._results.get("trashed", 0)))
-        table.add_row("Labeled", str(self._results.get("labeled", 0)))
-        table.add_row("Starred", str(self._results.get("starred", 0)))
+        table.add_rows([
+            ("Trashed", str(self._results.get("trashed", 0))),
+            ("Labeled", str(self._results.get("labeled", 0))),
+            ("Starred", str(self._results.get("starred", 0))),
+        ])
 
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "btn-back":
@@ -246,7 +248,9 @@ class MainScreen(Screen):
             handler()
 
     def _handle_signout(self) -> None:
+        from gmail.actions import _header_cache
         from gmail.auth import signout
+        _header_cache.clear()  # first, so no prefetch writes account data after signout
         signout()
         self.notify("Signed out. Local token deleted.", severity="warning")
 
@@ -292,29 +296,19 @@ class MainScreen(Screen):
         # Update auto-actions table
         table = self.query_one("#auto-table", DataTable)
         table.clear()
-        table.add_row(
-            "Priority (protected)",
-            str(len(result["to_priority"])),
-            "starred",
-        )
-        table.add_row(
-            f"Old (>{result['delete_days']}d)",
-            str(len(result["to_trash"])),
-            "move to Trash",
-        )
-        table.add_row(
-            "Duplicates",
-            str(len(result["dup_ids"])),
-            "Trash (keep 1)",
-        )
-
-        # Rebuild category checkboxes
+        table.add_rows([
+            ("Priority (protected)", str(len(result["to_priority"])), "starred"),
+            (f"Old (>{result['delete_days']}d)", str(len(result["to_trash"])), "move to Trash"),
+            ("Duplicates", str(len(result["dup_ids"])), "Trash (keep 1)"),
+        ])
+
+        # Rebuild category checkboxes, mounted together so the list lays out once
         cat_list = self.query_one("#cat-list", ScrollableContainer)
         cat_list.remove_children()
-        for category, msg_ids in result["category_groups"].items():
-            cat_list.mount(
-                Checkbox(f"{category}  ({len(msg_ids)} emails)", value=True, name=category)
-            )
+        cat_list.mount_all([
+            Checkbox(f"{category}  ({len(msg_ids)} emails)", value=True, name=category)
+            for category, msg_ids in result["category_groups"].items()
+        ])
 
         self._set_run_buttons_enabled(True)
 
@@ -331,8 +325,8 @@ class MainScreen(Screen):
 
     @work(thread=True)
     def _do_run(self, dry_run: bool, checked_cats: set[str], default_action: str) -> None:
-        from gmail.actions import _apply_labels
-        from gmail.client import trash_message, modify_labels
+        from gmail.actions import _apply_labels, _header_cache
+        from gmail.client import batch_modify_labels, batch_trash
 
         result = self._scan_data
         max_trash = self._config.get("automation", {}).get("max_trash_per_run", 100)
@@ -348,29 +342,22 @@ class MainScreen(Screen):
             elif default_action == "l":
                 to_label.extend([(mid, category) for mid in msg_ids])
 
+        priority = set(result["to_priority"])
+        to_trash = [mid for mid in dict.fromkeys(to_trash) if mid not in priority]
+
         if len(to_trash) > max_trash:
             to_trash = to_trash[:max_trash]
 
-        trashed = labeled = starred = 0
-
         if not dry_run:
-            for msg_id in to_trash:
-                trash_message(self._service, msg_id)
-                trashed += 1
+            batch_trash(self._service, to_trash)
+            _header_cache.discard(to_trash)
             _apply_labels(self._service, to_label)
-            labeled = len(to_label)
-            for msg_id in result["to_priority"]:
-                modify_labels(self._service, msg_id, add_labels=["STARRED"])
-                starred += 1
-        else:
-            trashed = len(to_trash)
-            labeled = len(to_label)
-            starred = len(result["to_priority"])
+            batch_modify_labels(self._service, result["to_priority"], add_labels=["STARRED"])
 
         run_result = {
-            "trashed": trashed,
-            "labeled": labeled,
-            "starred": starred,
+            "trashed": len(to_trash),
+            "labeled": len(to_label),
+            "starred": len(result["to_priority"]),
             "dry_run": dry_run,
         }
         self.app.call_from_thread(self._on_run_done, run_result)
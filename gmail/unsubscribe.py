@@ -1,15 +1,27 @@
 import re
+import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from rich.console import Console
 from rich.table import Table
+from rich.text import Text
 
 from gmail.analyzer import get_header
 
 console = Console()
 
+UNSUBSCRIBE_WORKERS = 16  # unsubscribe links mostly point at different hosts
+
+# Hosts that refused or timed out this session; retrying them just waits out the timeout again
+_dead_hosts = set()
+
+_MAILTO_RE = re.compile(r"<(mailto:[^>]+)>")
+_HTTP_RE = re.compile(r"<(https?://[^>]+)>")
+
 
 def get_unsubscribe_links(headers):
     """Parse List-Unsubscribe (and List-Unsubscribe-Post) headers.
@@ -22,8 +34,8 @@ def get_unsubscribe_links(headers):
         return None
 
     result = {}
-    mailto = re.search(r"<(mailto:[^>]+)>", header)
-    http = re.search(r"<(https?://[^>]+)>", header)
+    mailto = _MAILTO_RE.search(header)
+    http = _HTTP_RE.search(header)
 
     if mailto:
         result["mailto"] = mailto.group(1)
@@ -37,17 +49,38 @@ def get_unsubscribe_links(headers):
     return result if (result.get("mailto") or result.get("http")) else None
 
 
-def attempt_unsubscribe(service, links):
-    """Try to unsubscribe using the best available method.
+def attempt_unsubscribe_many(service, links_list, max_workers=UNSUBSCRIBE_WORKERS):
+    """Try to unsubscribe from each list using the best available method.
 
-    Returns (method, status) where status is one of:
+    Prefers one-click POST, then http GET, then mailto. Returns one
+    (method, status) per entry, in order, where status is one of:
       "ok"     — HTTP 2xx received or email sent
       "failed" — request errored out
       "manual" — non-2xx response, may need manual action
+
+    HTTP requests are independent and I/O-bound, so they run concurrently.
+    Mailto fallbacks go through the shared Gmail service one at a time,
+    paced to stay under Gmail's sending rate limit.
     """
-    # Prefer one-click POST, then http GET, then mailto
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(_try_http, links_list))
+    mailed = False
+    for i, links in enumerate(links_list):
+        if results[i] is None:
+            if mailed and links.get("mailto"):
+                time.sleep(1)
+            results[i] = _try_mailto(service, links)
+            mailed = mailed or results[i][0] == "mailto"
+    return results
+
+
+def _try_http(links):
+    """One-click POST or GET the http link; None if there is none or it errored out."""
     if links.get("http"):
         url = links["http"]
+        host = urllib.parse.urlsplit(url).netloc.lower()
+        if host in _dead_hosts:
+            return None
         try:
             if links.get("one_click"):
                 data = b"List-Unsubscribe=One-Click"
@@ -71,10 +104,16 @@ def attempt_unsubscribe(service, links):
             if e.code in (200, 201, 202, 204):
                 return ("http", "ok")
             return ("http", "manual")
+        except (urllib.error.URLError, OSError):
+            # Unreachable: skip the host for the rest of the session, fall back to mailto
+            _dead_hosts.add(host)
         except Exception:
-            # Fall through to mailto if http fails
+            # Caller falls back to mailto if http fails
             pass
+    return None
+
 
+def _try_mailto(service, links):
     if links.get("mailto"):
         try:
             from gmail.client import send_message
@@ -115,13 +154,18 @@ _JOB_ALERT_SENDERS = [
 ]
 
 
+# One alternation instead of a substring scan per term
+_JOB_ALERT_RE = re.compile("|".join(re.escape(t) for t in _JOB_ALERT_KEYWORDS + _JOB_ALERT_SENDERS))
+
+
+@lru_cache(maxsize=1024)
 def is_job_alert(sender: str, subject: str) -> bool:
-    """Return True if the email looks like a job/career alert."""
+    """Return True if the email looks like a job/career alert.
+
+    Memoized: the report table and the unsubscribe picker ask about the same emails.
+    """
     combined = ((sender or "") + " " + (subject or "")).lower()
-    return (
-        any(k in combined for k in _JOB_ALERT_KEYWORDS)
-        or any(s in combined for s in _JOB_ALERT_SENDERS)
-    )
+    return _JOB_ALERT_RE.search(combined) is not None
 
 
 def print_unsubscribe_report(items):
@@ -137,20 +181,17 @@ def print_unsubscribe_report(items):
     table.add_column("Subject", max_width=38)
     table.add_column("Unsubscribe Link", style="bold blue", max_width=50)
 
+    # Text cells skip markup parsing, which also keeps "[Weekly] ..." subjects intact
     for sender, subject, links in items:
         link = links.get("http") or links.get("mailto") or "—"
-        if is_job_alert(sender, subject):
-            table.add_row(
-                f"[bold magenta]{(sender or '—')[:38]}[/]",
-                f"[magenta]{(subject or '—')[:38]}[/]",
-                link,
-            )
-        else:
-            table.add_row(
-                f"[white]{(sender or '—')[:38]}[/]",
-                f"[dim]{(subject or '—')[:38]}[/]",
-                link,
-            )
+        sender_style, subject_style = (
+            ("bold magenta", "magenta") if is_job_alert(sender, subject) else ("white", "dim")
+        )
+        table.add_row(
+            Text((sender or "—")[:38], style=sender_style),
+            Text((subject or "—")[:38], style=subject_style),
+            Text(link),
+        )
 
     console.print(table)
     console.print()
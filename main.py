@@ -5,11 +5,7 @@ import argparse
 import os
 import sys
 
-import questionary
-import yaml
 from rich.console import Console
-from rich.markdown import Markdown
-from rich.panel import Panel
 
 console = Console()
 
@@ -81,8 +77,8 @@ def _load_config():
         console.print("[bold red]config.yaml not found.[/]")
         console.print("Copy config.example.yaml to config.yaml and edit it, then run again.")
         sys.exit(1)
-    with open("config.yaml") as f:
-        return yaml.safe_load(f)
+    from gmail.config import load_config
+    return load_config()
 
 
 def main():
@@ -128,6 +124,8 @@ def main():
 
     # Subcommands that don't need Gmail connection
     if args.command == "guide":
+        from rich.markdown import Markdown
+        from rich.panel import Panel
         console.print(Panel(Markdown(GUIDE_MD), title="[bold cyan]Gmail Graveyard[/]", border_style="cyan"))
         return
 
@@ -162,6 +160,8 @@ def main():
         return
 
     from gmail.actions import (
+        cancel_prefetch,
+        prefetch_inbox,
         run_browse_and_delete,
         run_cleanup,
         run_job_emails,
@@ -178,6 +178,10 @@ def main():
         and not args.days
     )
     if no_explicit_flags:
+        import questionary
+
+        # Fetch the inbox while the user is reading the menu
+        prefetch_inbox(service)
         while True:
             console.print()
             action_choice = questionary.select(
@@ -224,9 +228,11 @@ def main():
                     ],
                 ).ask()
                 if exit_choice is None or exit_choice.startswith("Soft"):
+                    cancel_prefetch()
                     console.print("[dim]Goodbye.[/]")
                 else:
                     from gmail.auth import signout
+                    cancel_prefetch(wait=True)
                     signout()
                 return
 
@@ -239,6 +245,7 @@ def main():
             ).ask()
 
             if mode_choice is None:
+                cancel_prefetch()
                 return
 
             dry_run = mode_choice.startswith("Dry")
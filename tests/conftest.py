@@ -0,0 +1,162 @@
+import os
+import sys
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gmail import client  # noqa: E402
+from gmail.inbox_cache import PrefetchCancelled  # noqa: E402
+
+
+class _Request:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self):
+        return self._fn()
+
+
+class _Messages:
+    def __init__(self, gmail):
+        self._gmail = gmail
+
+    def list(self, userId, q="", maxResults=100, pageToken=None):
+        def _run():
+            self._gmail.calls.append("messages.list")
+            start = int(pageToken or 0)
+            ids = self._gmail.inbox[start:start + maxResults]
+            response = {"messages": [{"id": msg_id, "threadId": msg_id} for msg_id in ids]}
+            if start + maxResults < len(self._gmail.inbox):
+                response["nextPageToken"] = str(start + maxResults)
+            return response
+        request = _Request(_run)
+        request.max_results = maxResults
+        return request
+
+    def list_next(self, request, response):
+        if "nextPageToken" not in response:
+            return None
+        return self.list("me", maxResults=request.max_results, pageToken=response["nextPageToken"])
+
+    def batchModify(self, userId, body):
+        def _run():
+            self._gmail.calls.append("messages.batchModify")
+            if self._gmail.batch_modify_status:
+                raise HttpError(httplib2.Response({"status": self._gmail.batch_modify_status}), b"rejected")
+            self._gmail.modified.append(list(body["ids"]))
+            return {}
+        return _Request(_run)
+
+    def trash(self, userId, id):
+        def _run():
+            self._gmail.calls.append("messages.trash")
+            self._gmail.trashed.append(id)
+            return {"id": id}
+        return _Request(_run)
+
+
+class _History:
+    def __init__(self, gmail):
+        self._gmail = gmail
+
+    def list(self, userId, startHistoryId):
+        def _run():
+            self._gmail.calls.append("history.list")
+            if self._gmail.history_expired:
+                raise HttpError(httplib2.Response({"status": 404}), b"history expired")
+            return {"history": self._gmail.history_records}
+        return _Request(_run)
+
+    def list_next(self, request, response):
+        return None
+
+
+class _Batch:
+    """Runs its requests in order; IDs in gmail.batch_failures fail inside the batch only."""
+
+    def __init__(self, gmail, callback):
+        self._gmail = gmail
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id):
+        self._requests.append((request_id, request))
+
+    def execute(self):
+        self._gmail.calls.append("batch")
+        for request_id, request in self._requests:
+            if request_id in self._gmail.batch_failures:
+                error = HttpError(httplib2.Response({"status": 500}), b"backend error")
+                self._callback(request_id, None, error)
+            else:
+                self._callback(request_id, request.execute(), None)
+
+
+class FakeGmail:
+    """Just enough of the Gmail service for listing, history, profile and trash calls.
+
+    inbox is a list of message IDs, newest first.
+    """
+
+    def __init__(self, inbox, history_id="100", email="me@example.com"):
+        self.inbox = list(inbox)
+        self.history_id = history_id
+        self.email = email
+        self.history_records = []
+        self.history_expired = False
+        self.batch_modify_status = None  # HTTP status batchModify fails with, if set
+        self.batch_failures = set()
+        self.modified = []  # ID chunks sent to batchModify
+        self.trashed = []
+        self.calls = []
+
+    def users(self):
+        return self
+
+    def messages(self):
+        return _Messages(self)
+
+    def history(self):
+        return _History(self)
+
+    def new_batch_http_request(self, callback):
+        return _Batch(self, callback)
+
+    def getProfile(self, userId):
+        def _run():
+            self.calls.append("getProfile")
+            return {"emailAddress": self.email, "historyId": self.history_id}
+        return _Request(_run)
+
+
+class FakeFetch:
+    """Stands in for actions._fetch_with_headers and records which IDs it was asked for."""
+
+    def __init__(self):
+        self.fetched = []
+
+    def __call__(self, service, pages, stop=None):
+        rows = []
+        for page in pages:
+            if stop is not None and stop.is_set():
+                raise PrefetchCancelled()
+            for msg in page:
+                self.fetched.append(msg["id"])
+                rows.append((msg["id"], {"subject": f"subject {msg['id']}"}))
+        return rows
+
+
+@pytest.fixture(autouse=True)
+def in_tmp_dir(tmp_path, monkeypatch):
+    """State files live in the working directory; keep each test's apart."""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(client, "clone_service", lambda service: service)
+    return tmp_path
+
+
+@pytest.fixture
+def fetch():
+    return FakeFetch()
@@ -0,0 +1,185 @@
+import types
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from conftest import FakeGmail
+
+from gmail import client
+
+
+class FakeClock:
+    """Stands in for the time module: sleeping just advances monotonic()."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(client, "time", types.SimpleNamespace(monotonic=clock.monotonic, sleep=clock.sleep))
+    monkeypatch.setattr(client.random, "random", lambda: 0.5)
+    monkeypatch.setattr(client, "_quota", client._QuotaBucket(client.QUOTA_UNITS_PER_MINUTE))
+    return clock
+
+
+def _http_error(status, content=b"", **headers):
+    return HttpError(httplib2.Response({"status": status, **headers}), content)
+
+
+def _failing(*errors, result="ok"):
+    """A callable that raises each error in turn, then returns result."""
+    errors = list(errors)
+    calls = []
+
+    def fn():
+        calls.append(1)
+        if errors:
+            raise errors.pop(0)
+        return result
+
+    fn.calls = calls
+    return fn
+
+
+def test_retry_backs_off_exponentially_on_retryable_statuses(clock):
+    fn = _failing(_http_error(503), _http_error(429))
+    assert client._retry(fn) == "ok"
+    assert clock.slept == [1.5, 2.5]
+
+
+def test_retry_caps_backoff_and_reraises_on_last_attempt(clock):
+    fn = _failing(*[_http_error(500) for _ in range(7)])
+    with pytest.raises(HttpError):
+        client._retry(fn, retries=7)
+    assert len(fn.calls) == 7
+    assert clock.slept == [1.5, 2.5, 4.5, 8.5, 16.5, 32]
+
+
+def test_retry_raises_not_found_immediately(clock):
+    fn = _failing(_http_error(404))
+    with pytest.raises(HttpError):
+        client._retry(fn)
+    assert len(fn.calls) == 1
+    assert clock.slept == []
+
+
+def test_rate_limit_403_is_retried(clock):
+    fn = _failing(_http_error(403, b'{"error": {"errors": [{"reason": "userRateLimitExceeded"}]}}'))
+    assert client._retry(fn) == "ok"
+    assert len(fn.calls) == 2
+
+
+def test_permission_403_is_raised_immediately(clock):
+    fn = _failing(_http_error(403, b'{"error": {"errors": [{"reason": "insufficientPermissions"}]}}'))
+    with pytest.raises(HttpError):
+        client._retry(fn)
+    assert len(fn.calls) == 1
+
+
+def test_retry_after_header_sets_the_wait(clock):
+    fn = _failing(_http_error(429, **{"retry-after": "7"}))
+    client._retry(fn)
+    assert clock.slept == [7]
+
+
+def test_retry_after_is_capped_at_max_backoff(clock):
+    fn = _failing(_http_error(503, **{"retry-after": "120"}))
+    client._retry(fn)
+    assert clock.slept == [client.MAX_BACKOFF]
+
+
+def test_network_errors_are_retried(clock):
+    fn = _failing(ConnectionResetError("Connection reset by peer"))
+    assert client._retry(fn) == "ok"
+    assert clock.slept == [1.5]
+
+
+def test_other_exceptions_are_not_retried(clock):
+    fn = _failing(ValueError("bad message id"))
+    with pytest.raises(ValueError):
+        client._retry(fn)
+    assert len(fn.calls) == 1
+
+
+def test_quota_bucket_starts_full(clock):
+    bucket = client._QuotaBucket(600)
+    bucket.consume(600)
+    assert clock.slept == []
+
+
+def test_quota_bucket_waits_for_the_deficit_when_empty(clock):
+    bucket = client._QuotaBucket(600)  # refills 10 units a second
+    bucket.consume(600)
+    bucket.consume(20)
+    assert clock.slept == [2]
+
+
+def test_quota_bucket_refills_at_its_rate_up_to_capacity(clock):
+    bucket = client._QuotaBucket(600)
+    bucket.consume(600)
+    clock.now += 3
+    bucket.consume(30)
+    assert clock.slept == []
+    clock.now += 3600
+    bucket.consume(600)
+    assert clock.slept == []
+    bucket.consume(10)
+    assert clock.slept == [1]
+
+
+def test_quota_bucket_does_not_hold_its_lock_while_waiting(clock):
+    bucket = client._QuotaBucket(600)
+    bucket.consume(600)
+
+    def sleep(seconds):
+        assert bucket._lock.acquire(blocking=False)
+        bucket._lock.release()
+        clock.sleep(seconds)
+
+    client.time.sleep = sleep
+    bucket.consume(10)
+    assert clock.slept == [1]
+
+
+def test_batch_trash_sends_at_most_a_thousand_ids_per_batch_modify(clock):
+    gmail = FakeGmail([])
+    client.batch_trash(gmail, [f"m{i}" for i in range(2500)])
+    assert [len(chunk) for chunk in gmail.modified] == [1000, 1000, 500]
+    assert gmail.trashed == []
+
+
+def test_batch_trash_falls_back_to_batched_trash_on_400(clock):
+    gmail = FakeGmail([])
+    gmail.batch_modify_status = 400
+    client.batch_trash(gmail, ["m1", "m2", "m1"])
+    assert gmail.trashed == ["m1", "m2"]
+    assert gmail.calls.count("batch") == 1
+
+
+def test_batch_trash_retries_failed_sub_requests_one_by_one(clock):
+    gmail = FakeGmail([])
+    gmail.batch_modify_status = 400
+    gmail.batch_failures = {"m2"}
+    client.batch_trash(gmail, ["m1", "m2", "m3"])
+    assert gmail.trashed == ["m1", "m3", "m2"]
+    assert gmail.calls.count("messages.trash") == 3
+
+
+def test_batch_trash_reraises_other_errors_without_falling_back(clock):
+    gmail = FakeGmail([])
+    gmail.batch_modify_status = 500
+    with pytest.raises(HttpError):
+        client.batch_trash(gmail, ["m1"])
+    assert gmail.trashed == []
+    assert "batch" not in gmail.calls
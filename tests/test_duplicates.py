@@ -0,0 +1,93 @@
+import random
+from collections import defaultdict
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+
+from gmail.analyzer import get_header, header_dict
+from gmail.duplicates import DuplicateTracker, find_duplicates
+
+
+def _baseline_find_duplicates(messages_with_headers):
+    """The original two-pass implementation, kept as the reference for equivalence."""
+    by_message_id = defaultdict(list)
+    no_message_id = []
+    for msg_id, headers in messages_with_headers:
+        mid = get_header(headers, "Message-ID").strip()
+        if mid:
+            by_message_id[mid].append(msg_id)
+        else:
+            no_message_id.append((msg_id, headers))
+    groups = [ids for ids in by_message_id.values() if len(ids) > 1]
+    fuzzy = defaultdict(list)
+    for msg_id, headers in no_message_id:
+        sender = get_header(headers, "From")
+        subject = get_header(headers, "Subject")
+        try:
+            dt = parsedate_to_datetime(get_header(headers, "Date"))
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
+            key = (sender, subject, dt.replace(second=0, microsecond=0))
+        except Exception:
+            key = (sender, subject, "")
+        fuzzy[key].append(msg_id)
+    return groups + [ids for ids in fuzzy.values() if len(ids) > 1]
+
+
+def _message(msg_id, message_id="", sender="a@example.com", subject="Hi", date="Mon, 1 Jan 2024 10:00:00 +0000"):
+    headers = [
+        {"name": "Message-ID", "value": message_id},
+        {"name": "From", "value": sender},
+        {"name": "Subject", "value": subject},
+        {"name": "Date", "value": date},
+    ]
+    return msg_id, header_dict(headers)
+
+
+def test_groups_keep_first_seen_order():
+    # B repeats before A does, but A was seen first
+    messages = [
+        _message("1", "<a>"), _message("2", "<b>"), _message("3", "<b>"), _message("4", "<a>"),
+    ]
+    assert find_duplicates(messages) == [["1", "4"], ["2", "3"]]
+
+
+def test_message_id_groups_come_before_fuzzy_groups():
+    messages = [
+        _message("1", subject="same"), _message("2", "<a>"),
+        _message("3", subject="same"), _message("4", "<a>"),
+    ]
+    assert find_duplicates(messages) == [["2", "4"], ["1", "3"]]
+
+
+def test_fuzzy_match_rounds_to_the_minute():
+    messages = [
+        _message("1", date="Mon, 1 Jan 2024 10:00:05 +0000"),
+        _message("2", date="Mon, 1 Jan 2024 10:00:55 +0000"),
+        _message("3", date="Mon, 1 Jan 2024 10:01:00 +0000"),
+        _message("4", date="not a date"),
+        _message("5", date=""),
+    ]
+    assert find_duplicates(messages) == [["1", "2"], ["4", "5"]]
+
+
+def test_tracker_matches_baseline_on_mixed_inbox():
+    rng = random.Random(7)
+    messages = [
+        _message(
+            f"m{i}",
+            message_id=rng.choice(["", "", f"<{rng.randrange(40)}>"]),
+            sender=f"s{rng.randrange(5)}@example.com",
+            subject=f"subject {rng.randrange(4)}",
+            date=rng.choice([
+                f"Mon, 1 Jan 2024 10:{rng.randrange(3):02d}:{rng.randrange(60):02d} +0000",
+                f"Mon, 1 Jan 2024 10:{rng.randrange(3):02d}:00",
+                "garbage",
+            ]),
+        )
+        for i in range(500)
+    ]
+    tracker = DuplicateTracker()
+    for msg_id, headers in messages:
+        tracker.add(msg_id, headers)
+    assert tracker.groups() == _baseline_find_duplicates(messages)
+    assert find_duplicates(messages) == _baseline_find_duplicates(messages)
@@ -0,0 +1,125 @@
+import json
+import os
+
+from conftest import FakeGmail
+
+from gmail.history import SNAPSHOT_FILE, clear_snapshot, sync_inbox
+
+
+def _ids(rows):
+    return [msg_id for msg_id, _ in rows]
+
+
+def _added(msg_id):
+    return {"messagesAdded": [{"message": {"id": msg_id, "labelIds": ["INBOX", "UNREAD"]}}]}
+
+
+def _trashed(msg_id):
+    return {"labelsAdded": [{"message": {"id": msg_id, "labelIds": ["TRASH"]}, "labelIds": ["TRASH"]}]}
+
+
+def _inboxed(msg_id):
+    return {"labelsAdded": [{"message": {"id": msg_id, "labelIds": ["INBOX"]}, "labelIds": ["INBOX"]}]}
+
+
+def _synced(gmail, max_results, fetch):
+    """Run a first sync so a snapshot exists, then forget what it cost."""
+    sync_inbox(gmail, max_results, fetch)
+    gmail.calls.clear()
+    fetch.fetched.clear()
+
+
+def test_first_sync_lists_everything_and_saves_snapshot(fetch):
+    gmail = FakeGmail(["m3", "m2", "m1"])
+    rows = sync_inbox(gmail, 10, fetch)
+    assert _ids(rows) == ["m3", "m2", "m1"]
+    assert fetch.fetched == ["m3", "m2", "m1"]
+    with open(SNAPSHOT_FILE) as f:
+        snapshot = json.load(f)
+    assert snapshot["history_id"] == "100"
+    assert snapshot["email"] == "me@example.com"
+
+
+def test_unchanged_mailbox_costs_no_listing_or_fetch(fetch):
+    gmail = FakeGmail(["m2", "m1"])
+    _synced(gmail, 10, fetch)
+    rows = sync_inbox(gmail, 10, fetch)
+    assert _ids(rows) == ["m2", "m1"]
+    assert "messages.list" not in gmail.calls
+    assert fetch.fetched == []
+
+
+def test_new_mail_is_fetched_and_prepended(fetch):
+    gmail = FakeGmail(["m2", "m1"])
+    _synced(gmail, 10, fetch)
+    gmail.inbox = ["m4", "m3", "m2", "m1"]
+    gmail.history_records = [_added("m3"), _added("m4")]
+    rows = sync_inbox(gmail, 10, fetch)
+    assert _ids(rows) == ["m4", "m3", "m2", "m1"]
+    assert fetch.fetched == ["m4", "m3"]
+    assert "messages.list" not in gmail.calls
+
+
+def test_removal_from_partial_snapshot_is_dropped_in_place(fetch):
+    gmail = FakeGmail(["m3", "m2", "m1"])
+    _synced(gmail, 10, fetch)
+    gmail.inbox = ["m3", "m1"]
+    gmail.history_records = [_trashed("m2")]
+    rows = sync_inbox(gmail, 10, fetch)
+    assert _ids(rows) == ["m3", "m1"]
+    assert fetch.fetched == []
+    assert "messages.list" not in gmail.calls
+
+
+def test_removal_from_full_snapshot_fetches_only_the_shortfall(fetch):
+    gmail = FakeGmail(["m5", "m4", "m3", "m2", "m1"])
+    _synced(gmail, 3, fetch)
+    gmail.inbox = ["m5", "m3", "m2", "m1"]
+    gmail.history_records = [_trashed("m4")]
+    rows = sync_inbox(gmail, 3, fetch)
+    assert _ids(rows) == ["m5", "m3", "m2"]
+    assert fetch.fetched == ["m2"]
+    assert gmail.calls.count("messages.list") == 1
+
+
+def test_reinboxed_old_mail_lands_in_listing_order(fetch):
+    gmail = FakeGmail(["m5", "m3"])
+    _synced(gmail, 10, fetch)
+    gmail.inbox = ["m5", "m4", "m3"]
+    gmail.history_records = [_inboxed("m4")]
+    rows = sync_inbox(gmail, 10, fetch)
+    assert _ids(rows) == ["m5", "m4", "m3"]
+    assert fetch.fetched == ["m4"]
+
+
+def test_expired_history_falls_back_to_full_scan(fetch):
+    gmail = FakeGmail(["m2", "m1"])
+    _synced(gmail, 10, fetch)
+    gmail.history_expired = True
+    rows = sync_inbox(gmail, 10, fetch)
+    assert _ids(rows) == ["m2", "m1"]
+    assert fetch.fetched == ["m2", "m1"]
+
+
+def test_snapshot_from_another_account_is_not_replayed(fetch):
+    gmail = FakeGmail(["m2", "m1"])
+    _synced(gmail, 10, fetch)
+    other = FakeGmail(["x1"], email="other@example.com")
+    rows = sync_inbox(other, 10, fetch)
+    assert _ids(rows) == ["x1"]
+    assert "history.list" not in other.calls
+
+
+def test_corrupt_snapshot_falls_back_to_full_scan(fetch):
+    with open(SNAPSHOT_FILE, "w") as f:
+        f.write('{"email": "me@example.com", "hist')
+    gmail = FakeGmail(["m1"])
+    rows = sync_inbox(gmail, 10, fetch)
+    assert _ids(rows) == ["m1"]
+    assert "history.list" not in gmail.calls
+
+
+def test_clear_snapshot_removes_the_file(fetch):
+    sync_inbox(FakeGmail(["m1"]), 10, fetch)
+    clear_snapshot()
+    assert not os.path.exists(SNAPSHOT_FILE)
@@ -0,0 +1,91 @@
+import os
+import threading
+import time
+
+from conftest import FakeGmail
+
+from gmail.history import INBOX_QUERY, SNAPSHOT_FILE, clear_snapshot
+from gmail.inbox_cache import HeaderCache, PrefetchCancelled
+
+
+def _ids(rows):
+    return [msg_id for msg_id, _ in rows]
+
+
+def test_get_uses_finished_prefetch(fetch):
+    gmail, cache = FakeGmail(["m2", "m1"]), HeaderCache()
+    cache.prefetch(gmail, INBOX_QUERY, 10, fetch)
+    cache._pending[(INBOX_QUERY, 10)][0].result(timeout=5)
+    assert _ids(cache.get(gmail, INBOX_QUERY, 10, fetch)) == ["m2", "m1"]
+    assert fetch.fetched == ["m2", "m1"]
+
+
+def test_failed_prefetch_is_loaded_again_in_get(fetch):
+    gmail, cache = FakeGmail(["m1"]), HeaderCache()
+
+    def failing_fetch(service, pages, stop=None):
+        raise ConnectionError("network down")
+
+    cache.prefetch(gmail, INBOX_QUERY, 10, failing_fetch)
+    assert _ids(cache.get(gmail, INBOX_QUERY, 10, fetch)) == ["m1"]
+
+
+def test_get_for_another_query_cancels_prefetch(fetch):
+    gmail, cache = FakeGmail(["m1"]), HeaderCache()
+    started, stops = threading.Event(), []
+
+    def blocking_fetch(service, pages, stop=None):
+        stops.append(stop)
+        started.set()
+        stop.wait(timeout=5)
+        raise PrefetchCancelled()
+
+    cache.prefetch(gmail, INBOX_QUERY, 10, blocking_fetch)
+    assert started.wait(timeout=5)
+    assert _ids(cache.get(gmail, "older_than:30d", 10, fetch)) == ["m1"]
+    assert stops[0].is_set()
+    assert not cache._pending
+
+
+def test_cached_query_is_reused_while_mailbox_is_unchanged(fetch):
+    gmail, cache = FakeGmail(["m2", "m1"]), HeaderCache()
+    cache.get(gmail, "older_than:30d", 10, fetch)
+    gmail.calls.clear()
+    assert _ids(cache.get(gmail, "older_than:30d", 10, fetch)) == ["m2", "m1"]
+    assert gmail.calls == ["getProfile"]
+
+
+def test_any_cached_query_is_reloaded_when_history_moves(fetch):
+    gmail, cache = FakeGmail(["m2", "m1"]), HeaderCache()
+    cache.get(gmail, "older_than:30d", 10, fetch)
+    gmail.inbox, gmail.history_id = ["m1"], "101"
+    assert _ids(cache.get(gmail, "older_than:30d", 10, fetch)) == ["m1"]
+
+
+def test_cached_inbox_is_resynced_from_history(fetch):
+    gmail, cache = FakeGmail(["m1"]), HeaderCache()
+    cache.get(gmail, INBOX_QUERY, 10, fetch)
+    gmail.inbox, gmail.history_id = ["m2", "m1"], "101"
+    gmail.history_records = [{"messagesAdded": [{"message": {"id": "m2", "labelIds": ["INBOX"]}}]}]
+    gmail.calls.clear()
+    assert _ids(cache.get(gmail, INBOX_QUERY, 10, fetch)) == ["m2", "m1"]
+    assert "history.list" in gmail.calls and "messages.list" not in gmail.calls
+
+
+def test_waiting_cancel_keeps_prefetch_from_writing_after_signout():
+    gmail, cache = FakeGmail(["m1"]), HeaderCache()
+    started = threading.Event()
+
+    def slow_fetch(service, pages, stop=None):
+        # A batch already in flight when cancel arrives still completes
+        started.set()
+        stop.wait(timeout=5)
+        time.sleep(0.1)
+        return [(msg["id"], {}) for page in pages for msg in page]
+
+    cache.prefetch(gmail, INBOX_QUERY, 10, slow_fetch)
+    assert started.wait(timeout=5)
+    cache.cancel_prefetch(wait=True)
+    clear_snapshot()  # what signout does next
+    time.sleep(0.2)
+    assert not os.path.exists(SNAPSHOT_FILE)
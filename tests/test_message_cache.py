@@ -0,0 +1,31 @@
+import os
+
+from gmail import message_cache
+from gmail.message_cache import CACHE_FILE, clear_cache, get_cached, put_many
+
+
+def test_roundtrip():
+    put_many([("m1", {"subject": "hello"}), ("m2", {"subject": "world"})])
+    assert get_cached(["m1", "m2", "m3"]) == {"m1": {"subject": "hello"}, "m2": {"subject": "world"}}
+
+
+def test_lookup_of_more_ids_than_one_query_binds():
+    put_many([(f"m{i}", {"n": i}) for i in range(1200)])
+    found = get_cached([f"m{i}" for i in range(1300)])
+    assert len(found) == 1200
+    assert found["m1199"] == {"n": 1199}
+
+
+def test_header_set_change_invalidates_cache(monkeypatch):
+    put_many([("m1", {"subject": "hello"})])
+    monkeypatch.setattr(message_cache, "_FIELDS", message_cache._FIELDS + ",To")
+    assert get_cached(["m1"]) == {}
+    put_many([("m2", {"subject": "new"})])
+    assert get_cached(["m1", "m2"]) == {"m2": {"subject": "new"}}
+
+
+def test_clear_cache_removes_database_files():
+    put_many([("m1", {"subject": "hello"})])
+    clear_cache()
+    assert not any(os.path.exists(CACHE_FILE + suffix) for suffix in ("", "-wal", "-shm"))
+    assert get_cached(["m1"]) == {}
@@ -0,0 +1,52 @@
+import json
+import os
+
+from gmail.state import (
+    REVIEWED_FILE, clear_reviewed, count_reviewed, load_reviewed, mark_reviewed, write_atomic,
+)
+
+
+def test_missing_file_means_nothing_reviewed():
+    assert load_reviewed() == set()
+
+
+def test_marks_accumulate_across_appends():
+    mark_reviewed(["m1", "m2"])
+    mark_reviewed(["m2", "m3"])
+    assert load_reviewed() == {"m1", "m2", "m3"}
+    assert count_reviewed() == 3
+
+
+def test_old_single_list_format_still_loads_and_appends():
+    with open(REVIEWED_FILE, "w") as f:
+        json.dump(["m1", "m2"], f)
+    mark_reviewed(["m3"])
+    assert load_reviewed() == {"m1", "m2", "m3"}
+
+
+def test_torn_last_line_is_skipped():
+    mark_reviewed(["m1"])
+    with open(REVIEWED_FILE, "a") as f:
+        f.write('\n["m2", "m')
+    assert load_reviewed() == {"m1"}
+    mark_reviewed(["m3"])
+    assert load_reviewed() == {"m1", "m3"}
+
+
+def test_empty_mark_writes_nothing():
+    mark_reviewed([])
+    assert not os.path.exists(REVIEWED_FILE)
+
+
+def test_clear_reviewed():
+    mark_reviewed(["m1"])
+    clear_reviewed()
+    assert load_reviewed() == set()
+
+
+def test_write_atomic_replaces_the_file_and_leaves_no_temp():
+    write_atomic("state.txt", "old")
+    write_atomic("state.txt", "new")
+    with open("state.txt") as f:
+        assert f.read() == "new"
+    assert not os.path.exists("state.txt.tmp")